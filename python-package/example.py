@@ -55,23 +55,21 @@ def main():
         if summaries:
             print(f"✅ Found document summaries for {len(summaries)} classes:\n")
             
+            # Fetch every class's documents concurrently
+            documents = client.lea.get_all_class_documents(summaries)
+            
             for summary in summaries:
                 print(f"  📚 {summary.name}")
                 print(f"     Available documents: {summary.available_documents}")
                 
-                # Get documents for first class as example
-                if summary == summaries[0]:
-                    print(f"\n     Fetching documents...")
-                    categories = client.lea.get_class_documents_by_href(summary.href)
-                    
-                    for category in categories:
-                        print(f"\n     Category: {category.name}")
-                        for doc in category.documents[:3]:  # Show first 3 documents
-                            status = "✓" if doc.viewed else "✗"
-                            print(f"       {status} {doc.name}")
-                            print(f"         Posted: {doc.posted}")
-                        if len(category.documents) > 3:
-                            print(f"       ... and {len(category.documents) - 3} more")
+                for category in documents.get(summary.name, []):
+                    print(f"\n     Category: {category.name}")
+                    for doc in category.documents[:3]:  # Show first 3 documents
+                        status = "✓" if doc.viewed else "✗"
+                        print(f"       {status} {doc.name}")
+                        print(f"         Posted: {doc.posted}")
+                    if len(category.documents) > 3:
+                        print(f"       ... and {len(category.documents) - 3} more")
                 print()
         
         # Get messages
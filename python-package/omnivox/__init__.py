@@ -17,7 +17,8 @@ Example:
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-from .client import OmnivoxClient
+from typing import TYPE_CHECKING
+
 from .exceptions import (
     OmnivoxError,
     AuthenticationError,
@@ -25,10 +26,37 @@ from .exceptions import (
     ParsingError,
 )
 
+# Type checkers and IDEs don't run __getattr__, so they see the clients here
+if TYPE_CHECKING:
+    from .client import OmnivoxClient
+    from .async_client import AsyncOmnivoxClient
+
 __all__ = [
     "OmnivoxClient",
+    "AsyncOmnivoxClient",
     "OmnivoxError",
     "AuthenticationError",
     "NetworkError",
     "ParsingError",
 ]
+
+# The clients pull in requests and the parsers, so they are only imported when
+# first used; `import omnivox.utils` or `omnivox.exceptions` stays lightweight
+_LAZY_ATTRIBUTES = {
+    "OmnivoxClient": ".client",
+    "AsyncOmnivoxClient": ".async_client",
+}
+
+
+def __getattr__(name: str):
+    """Import the client classes on first access (PEP 562)."""
+    if name in _LAZY_ATTRIBUTES:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
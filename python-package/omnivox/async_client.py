@@ -0,0 +1,114 @@
+"""Asyncio interface for the Omnivox API client."""
+
+import asyncio
+from typing import Optional
+
+from .client import OmnivoxClient
+from .lea.models import LeaClass, Category, ClassDocumentSummary
+from .mio.models import Mio, MioPreview
+
+
+class AsyncOmnivoxClient:
+    """
+    Asyncio wrapper around OmnivoxClient.
+    
+    Every blocking call runs in a worker thread over the client's pooled
+    session, so several fetches can be awaited together with asyncio.gather()
+    without blocking the event loop. The managers are reached inside the
+    worker too, since their first access sends a cookie request.
+    
+    Example:
+        >>> client = await AsyncOmnivoxClient.login("student_id", "password")
+        >>> documents = await client.get_all_class_documents()
+        >>> previews = await client.get_message_previews()
+    """
+    
+    def __init__(self, client: OmnivoxClient):
+        """
+        Wrap an already authenticated client.
+        
+        Args:
+            client: Authenticated OmnivoxClient
+        """
+        self._client = client
+    
+    @classmethod
+    async def login(cls, username: str, password: str) -> 'AsyncOmnivoxClient':
+        """
+        Authenticate with Omnivox without blocking the event loop.
+        
+        Args:
+            username: Student ID
+            password: Password
+        
+        Returns:
+            AsyncOmnivoxClient instance
+        
+        Raises:
+            AuthenticationError: If login fails
+            NetworkError: If connection fails
+        """
+        client = await asyncio.to_thread(OmnivoxClient, username, password)
+        return cls(client)
+    
+    @property
+    def client(self) -> OmnivoxClient:
+        """Access the underlying synchronous client."""
+        return self._client
+    
+    async def get_all_classes(self, force_refresh: bool = False) -> list[LeaClass]:
+        """Async version of LeaManager.get_all_classes()."""
+        return await asyncio.to_thread(lambda: self._client.lea.get_all_classes(force_refresh))
+    
+    async def get_class_document_summary(self, force_refresh: bool = False) -> list[ClassDocumentSummary]:
+        """Async version of LeaManager.get_class_document_summary()."""
+        return await asyncio.to_thread(
+            lambda: self._client.lea.get_class_document_summary(force_refresh)
+        )
+    
+    async def get_class_documents_by_href(self, href: str) -> list[Category]:
+        """Async version of LeaManager.get_class_documents_by_href()."""
+        return await asyncio.to_thread(lambda: self._client.lea.get_class_documents_by_href(href))
+    
+    async def get_all_class_documents(
+        self,
+        summaries: Optional[list[ClassDocumentSummary]] = None
+    ) -> dict[str, list[Category]]:
+        """
+        Get documents for several classes concurrently.
+        
+        Args:
+            summaries: Classes to fetch (defaults to get_class_document_summary())
+        
+        Returns:
+            Dict mapping class name to its list of Category objects
+        """
+        if summaries is None:
+            summaries = await self.get_class_document_summary()
+        
+        results = await asyncio.gather(
+            *(self.get_class_documents_by_href(summary.href) for summary in summaries)
+        )
+        return {summary.name: categories for summary, categories in zip(summaries, results)}
+    
+    async def get_message_previews(self) -> list[MioPreview]:
+        """Async version of MioManager.get_message_previews()."""
+        return await asyncio.to_thread(lambda: self._client.mio.get_message_previews())
+    
+    async def get_message_by_id(self, message_id: str) -> Mio:
+        """Async version of MioManager.get_message_by_id()."""
+        return await asyncio.to_thread(lambda: self._client.mio.get_message_by_id(message_id))
+
+    async def get_messages_by_ids(self, message_ids: list[str]) -> list[Mio]:
+        """
+        Get several full messages concurrently.
+        
+        Args:
+            message_ids: Message IDs (UUID format)
+        
+        Returns:
+            List of Mio objects, in the order of message_ids
+        """
+        return list(await asyncio.gather(
+            *(self.get_message_by_id(message_id) for message_id in message_ids)
+        ))
@@ -1,13 +1,39 @@
 """Authentication module for Omnivox API."""
 
+import os
 import requests
-from bs4 import BeautifulSoup
+from http.cookiejar import LWPCookieJar
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
 from typing import Optional
 
 from .exceptions import AuthenticationError, NetworkError
 from .utils import extract_k_token
 
 
+def create_http_adapter() -> HTTPAdapter:
+    """
+    Build the transport adapter used for Omnivox sessions.
+    
+    The connection pool is large enough for concurrent fetches to reuse
+    keep-alive connections, and transient gateway errors are retried with
+    exponential backoff.
+    
+    Returns:
+        Configured HTTPAdapter
+    """
+    return HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods={'GET', 'POST'},
+        )
+    )
+
+
 class OmnivoxAuth:
     """
     Handles authentication with Omnivox.
@@ -21,15 +47,41 @@ class OmnivoxAuth:
     BASE_URL = "https://dawsoncollege.omnivox.ca"
     LOGIN_URL = f"{BASE_URL}/intr/Module/Identification/Login/Login.aspx"
     
-    def __init__(self):
-        """Initialize authentication with a new session."""
-        self.session = requests.Session()
+    def __init__(
+        self,
+        cookie_jar_path: Optional[str] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Initialize authentication with a new or provided session.
+        
+        Args:
+            cookie_jar_path: Optional file used to persist session cookies between runs.
+                             Use one file per account.
+            session: Optional session to use instead of a new one. The browser
+                     headers and pooled adapter are applied to it.
+        """
+        self.session = session if session is not None else requests.Session()
+        self._cookie_jar: Optional[LWPCookieJar] = None
+        if cookie_jar_path:
+            # Restore cookies from a previous run; ASP.NET session cookies have no
+            # expiry date, so discardable cookies are kept as well
+            self._cookie_jar = LWPCookieJar(os.path.expanduser(cookie_jar_path))
+            if os.path.exists(self._cookie_jar.filename):
+                self._cookie_jar.load(ignore_discard=True)
+            self.session.cookies = self._cookie_jar
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         })
+        # Only advertise encodings urllib3 can decode (br needs brotli installed)
+        self.session.headers['Accept-Encoding'] = make_headers(accept_encoding=True)['accept-encoding']
+        
+        # Pooled keep-alive connections with retries on gateway errors
+        self.session.mount('https://', create_http_adapter())
         self._authenticated = False # Authentication state
+        self._session_restored = False # Whether login reused the saved cookies
     
     def login(self, username: str, password: str) -> bool:
         """
@@ -51,8 +103,16 @@ class OmnivoxAuth:
             response = self.session.get(self.LOGIN_URL)
             response.raise_for_status()
             
+            # Restored cookies may still hold a valid session, in which case the
+            # page already shows the signed-in header and no POST is needed
+            if self._cookie_jar is not None and b'headerNavbarLink' in response.content:
+                self._authenticated = True
+                self._session_restored = True
+                return True
+            self._session_restored = False
+            
             # Step 2: Extract hidden 'k' token from HTML
-            k_token = extract_k_token(response.text)
+            k_token = extract_k_token(response.content)
             if not k_token:
                 raise AuthenticationError("Could not extract authentication token from login page")
             
@@ -72,8 +132,9 @@ class OmnivoxAuth:
             
             # Step 4: Check if login was successful
             # Successful login contains "headerNavbarLink" in the response
-            if 'headerNavbarLink' in response.text:
+            if b'headerNavbarLink' in response.content:
                 self._authenticated = True
+                self.save_cookies()
                 return True
             else:
                 raise AuthenticationError("Invalid credentials")
@@ -81,11 +142,26 @@ class OmnivoxAuth:
         except requests.RequestException as e:
             raise NetworkError(f"Network error during login: {str(e)}")
     
+    def save_cookies(self):
+        """Write the session cookies to the cookie jar file, if one is configured."""
+        if self._cookie_jar is not None:
+            self._cookie_jar.save(ignore_discard=True)
+    
     @property
     def is_authenticated(self) -> bool:
         """Check if currently authenticated."""
         return self._authenticated
     
+    @property
+    def session_restored(self) -> bool:
+        """
+        Check if the last login reused the saved session instead of posting credentials.
+        
+        After a fresh login, service cookies restored from the jar belong to the
+        expired session and must not be reused.
+        """
+        return self._session_restored
+    
     def get_session(self) -> requests.Session:
         """
         Get the authenticated session.
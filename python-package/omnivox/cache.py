@@ -0,0 +1,104 @@
+"""On-disk response cache for Omnivox pages."""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """A page body stored in the response cache."""
+    content: bytes                          # Raw response body
+    encoding: Optional[str]                 # Charset declared by the server
+    fetched_at: float                       # Unix timestamp of the download
+    
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the page was downloaded."""
+        return time.time() - self.fetched_at
+
+
+class ResponseCache:
+    """
+    Small SQLite cache of page bodies keyed by URL.
+    
+    Entries are namespaced (typically by student ID) so several accounts can
+    share one cache file. Nothing is evicted on read: callers decide from an
+    entry's age whether it is still fresh enough to use.
+    
+    Example:
+        >>> cache = ResponseCache("~/.cache/omnivox.sqlite", namespace="1234567")
+        >>> cache.set(url, response.content, "utf-8")
+        >>> cached = cache.get(url)
+    """
+    
+    def __init__(self, path: str, namespace: str = ""):
+        """
+        Open (or create) a cache database.
+        
+        Args:
+            path: Path of the SQLite database file
+            namespace: Key prefix separating entries of different accounts
+        """
+        self.path = os.path.expanduser(path)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " namespace TEXT NOT NULL,"
+                " url TEXT NOT NULL,"
+                " content BLOB NOT NULL,"
+                " encoding TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, url))"
+            )
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached page.
+        
+        Args:
+            url: URL of the page
+        
+        Returns:
+            CachedResponse if the page is cached, None otherwise
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, encoding, fetched_at FROM responses WHERE namespace = ? AND url = ?",
+                (self.namespace, url)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        return CachedResponse(content=row[0], encoding=row[1], fetched_at=row[2])
+    
+    def set(self, url: str, content: bytes, encoding: Optional[str] = None):
+        """
+        Store a freshly downloaded page.
+        
+        Args:
+            url: URL of the page
+            content: Raw response body
+            encoding: Charset declared by the server, if any
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, url, content, encoding, time.time())
+            )
+    
+    def clear(self):
+        """Remove every entry of this cache's namespace."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE namespace = ?", (self.namespace,))
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,11 @@
 """Main Omnivox API client."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from .auth import OmnivoxAuth
+from .cache import ResponseCache
 from .lea.manager import LeaManager
 from .mio.manager import MioManager
 from .exceptions import AuthenticationError
@@ -30,40 +35,66 @@ class OmnivoxClient:
         ...     print(f"From {msg.author}: {msg.title}")
     """
     
-    def __init__(self, username: str, password: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        cache_path: Optional[str] = None,
+        cookie_jar_path: Optional[str] = None
+    ):
         """
         Initialize Omnivox client and authenticate.
         
         Args:
             username: Student ID
             password: Password
+            cache_path: Optional SQLite file used to cache LEA pages between runs
+            cookie_jar_path: Optional file used to keep session cookies between runs,
+                             skipping the login POST while they remain valid
             
         Raises:
             AuthenticationError: If login fails
             NetworkError: If connection fails
         """
         # Authenticate
-        self._auth = OmnivoxAuth()
+        self._auth = OmnivoxAuth(cookie_jar_path=cookie_jar_path)
         success = self._auth.login(username, password)
         
         if not success:
             raise AuthenticationError("Failed to authenticate with Omnivox")
         
         # Get authenticated session
-        session = self._auth.get_session()
+        self._session = self._auth.get_session()
+        
+        # Responses are cached per student so accounts never see each other's pages
+        self._cache = ResponseCache(cache_path, namespace=username) if cache_path else None
         
-        # Initialize managers
-        self._lea = LeaManager(session)
-        self._mio = MioManager(session)
+        # Managers are created on first access so unused services cost no requests
+        self._lea: Optional[LeaManager] = None
+        self._mio: Optional[MioManager] = None
+        self._lea_lock = threading.Lock()
+        self._mio_lock = threading.Lock()
     
     @property
     def lea(self) -> LeaManager:
         """
         Access LEA (Learning Environment) manager.
         
+        The manager (and its LEA cookie request) is created on first access.
+        
         Returns:
             LeaManager instance
         """
+        if self._lea is None:
+            with self._lea_lock:
+                if self._lea is None:
+                    self._lea = LeaManager(
+                        self._session,
+                        cache=self._cache,
+                        reuse_cookies=self._auth.session_restored
+                    )
+                    # Persist the LEA cookies the manager just received
+                    self._auth.save_cookies()
         return self._lea
     
     @property
@@ -71,11 +102,49 @@ class OmnivoxClient:
         """
         Access MIO (Internal Messaging) manager.
         
+        The manager (and its MIO cookie request) is created on first access.
+        
         Returns:
             MioManager instance
         """
+        if self._mio is None:
+            with self._mio_lock:
+                if self._mio is None:
+                    self._mio = MioManager(self._session)
+                    # Persist the MIO cookies the manager just received
+                    self._auth.save_cookies()
         return self._mio
     
+    def warm_up(self):
+        """
+        Create the LEA and MIO managers ahead of time, concurrently.
+        
+        Both cookie requests are sent in parallel over the pooled session, so a
+        script that uses both services pays for one round trip instead of two.
+        
+        Raises:
+            NetworkError: If either cookie request fails
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            lea = executor.submit(lambda: self.lea)
+            mio = executor.submit(lambda: self.mio)
+            lea.result()
+            mio.result()
+    
+    def close(self):
+        """
+        Stop background refreshes, save the session cookies and release the
+        response cache.
+        
+        Cookies refreshed by later requests are only written to the cookie jar
+        here, so call this once the client is no longer needed.
+        """
+        if self._lea is not None:
+            self._lea.close()
+        self._auth.save_cookies()
+        if self._cache is not None:
+            self._cache.close()
+    
     @property
     def is_authenticated(self) -> bool:
         """Check if client is authenticated."""
@@ -1,15 +1,91 @@
 """LEA Manager for accessing Learning Environment data."""
 
+import logging
 import re
 import requests
-from bs4 import BeautifulSoup
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree, html
 from typing import Optional
 
+from ..cache import ResponseCache
 from ..exceptions import NetworkError, ParsingError, NotFoundError
-from ..utils import decode_html_entities, remove_extra_whitespace, safe_int, safe_float, parse_schedule
+from ..utils import (
+    decode_html_entities, remove_extra_whitespace, safe_int, safe_float, parse_schedule,
+    xpath_has_class, first_by_id_or_class, declared_encoding, parse_html, parse_html_stream
+)
 from .models import LeaClass, Document, Category, ClassDocumentSummary
 
 
+logger = logging.getLogger(__name__)
+
+
+# Class cards on the LEA home page and their fields
+_CARDS = etree.XPath(f"//*[{xpath_has_class('card-panel')}]")
+_TITLE = etree.XPath(f"string(.//*[{xpath_has_class('card-panel-title')}])")
+_DESC = etree.XPath(f"string(.//*[{xpath_has_class('card-panel-desc')}])")
+_NOTES = etree.XPath(f".//*[{xpath_has_class('note-principale')}]")
+_FILES = etree.XPath(f".//*[{xpath_has_class('file-indicator-number')}]")
+
+_SUMMARY_ROWS = etree.XPath(f"//*[{xpath_has_class('itemDataGrid')} or {xpath_has_class('itemDataGridAltern')}]")
+
+_CATEGORY_TABLES = etree.XPath(f"//*[{xpath_has_class('CategorieDocumentEtudiant')}]")
+_TABLE_ROWS = etree.XPath(".//tr")
+# All fields of a document row (name, description, posted date, viewed marker) in one walk
+_DOC_NAME_CLASS = 'lblTitreDocumentDansListe'
+_DOC_DESC_CLASS = 'divDescriptionDocumentDansListe'
+_DOC_POSTED_CLASS = 'DocDispo'
+_DOC_VIEWED_ID = 'colonneEtoileVisualisation'
+_DOC_FIELDS = etree.XPath(
+    f".//*[{xpath_has_class(_DOC_NAME_CLASS)} or {xpath_has_class(_DOC_DESC_CLASS)}"
+    f" or {xpath_has_class(_DOC_POSTED_CLASS)} or @id='{_DOC_VIEWED_ID}']"
+)
+_CATEGORY_NAME = etree.XPath(f"(.//*[{xpath_has_class('boutonEnabled')}])[1]")
+_NODE_COUNT = etree.XPath("count(node())")
+
+# Runs of tabs/CR/LF in document descriptions
+_WS_CLEAN_RE = re.compile(r'[\t\r\n]+')
+# Card description: "<section> - <schedule, ...>, <teacher>"
+_DESC_RE = re.compile(r'(0\S*)\s*-\s*(.*),\s*([^,]+)$', re.DOTALL)
+
+
+def _split_description(desc_text: str) -> tuple[str, str, str]:
+    """
+    Split a class card description into section, schedule text and teacher.
+    
+    One regex match covers the usual layout; unusual descriptions fall back to
+    the substring logic of the TypeScript implementation.
+    
+    Args:
+        desc_text: Text of the card's description element
+    
+    Returns:
+        Tuple of (section, schedule_text, teacher)
+    
+    Reference: archive/omnivox-crawler/src/modules/lea/Lea.ts
+    """
+    match = _DESC_RE.search(desc_text)
+    if match:
+        section, schedule_text, teacher = match.groups()
+        return section.strip(), schedule_text, teacher.strip()
+    
+    # Parse section (between first "0" and " -")
+    section_start = desc_text.find('0')
+    section_end = desc_text.find(' -')
+    section = desc_text[section_start:section_end].strip() if section_start != -1 and section_end != -1 else ""
+    
+    # Parse schedule (between "- " and last ", ")
+    schedule_start = desc_text.find('- ') + 2
+    schedule_end = desc_text.rfind(', ')
+    schedule_text = desc_text[schedule_start:schedule_end] if schedule_start > 1 and schedule_end != -1 else ""
+    
+    # Parse teacher (after last ", ")
+    teacher = desc_text[schedule_end + 2:].strip() if schedule_end != -1 else ""
+    
+    return section, schedule_text, teacher
+
+
 class LeaManager:
     """
     Manager for LEA (Learning Environment) operations.
@@ -26,21 +102,61 @@ class LeaManager:
     LEA_URL = f"{BASE_URL}/cvir/doce/Default.aspx"
     LEA_COOKIE_URL = "https://dawsoncollege.omnivox.ca/intr/Module/ServicesExterne/Skytech.aspx?IdServiceSkytech=Skytech_Omnivox&lk=%2festd%2fcvie&IdService=CVIE&C=DAW&E=P&L=ANG"
     DOCUMENT_SUMMARY_URL = f"{BASE_URL}/cvir/ddle/SommaireDocuments.aspx"
+    LEA_COOKIE_DOMAIN = "www-daw-ovx.omnivox.ca"
+    
+    # Seconds a page from the response cache is served before being revalidated
+    CLASSES_TTL = 120
+    DOCUMENT_SUMMARY_TTL = 120
+    DOCUMENTS_TTL = 600
+    
+    # Seconds parsed classes are kept in memory, and a failed fetch is remembered
+    CLASSES_MEMORY_TTL = 300
+    CLASSES_FAILURE_TTL = 10
     
-    def __init__(self, session: requests.Session):
+    # Seconds a background refresh waits on the server before giving up
+    REFRESH_TIMEOUT = 30
+    
+    def __init__(
+        self,
+        session: requests.Session,
+        cache: Optional[ResponseCache] = None,
+        reuse_cookies: bool = False
+    ):
         """
         Initialize LEA Manager.
         
         Args:
             session: Authenticated requests session
+            cache: Optional on-disk response cache for LEA pages
+            reuse_cookies: Whether an LEA cookie already in the session may be reused.
+                           Only pass True when the login resumed a saved session;
+                           after a fresh login, restored cookies belong to the
+                           expired session.
         """
         self.session = session
+        self._cache = cache
+        self._reuse_cookies = reuse_cookies
         self._classes_cache: list[LeaClass] = []
+        self._classes_fetched_at: Optional[float] = None
+        self._classes_failed_at: Optional[float] = None
+        self._classes_error: Optional[requests.RequestException] = None
+        self._classes_by_code: dict[str, LeaClass] = {}
+        self._teachers_upper: list[tuple[str, LeaClass]] = []
+        self._titles_upper: list[tuple[str, LeaClass]] = []
+        self._class_lookups: dict[tuple[str, str], Optional[LeaClass]] = {}
         self._document_summary_cache: list[ClassDocumentSummary] = []
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
         self._initialize()
     
     def _initialize(self):
         """Initialize LEA session by getting required cookies."""
+        # Cookies restored from a previous run make the round trip unnecessary,
+        # as long as the login resumed that run's session
+        if self._reuse_cookies and self._has_lea_cookie():
+            return
+        
         try:
             # Get LEA authentication cookie
             # Reference: omnivox-crawler/src/modules/lea/LeaCookie.ts
@@ -48,6 +164,86 @@ class LeaManager:
         except requests.RequestException as e:
             raise NetworkError(f"Failed to initialize LEA session: {str(e)}")
     
+    def _has_lea_cookie(self) -> bool:
+        """Check whether the session already holds an unexpired LEA cookie."""
+        now = time.time()
+        return any(
+            cookie.domain.lstrip('.') == self.LEA_COOKIE_DOMAIN and not cookie.is_expired(now)
+            for cookie in self.session.cookies
+        )
+    
+    def _fetch_with_swr(self, url: str, ttl: float, force_refresh: bool = False) -> html.HtmlElement:
+        """
+        Fetch and parse a page, serving it from the response cache when possible.
+        
+        A cached page is returned immediately even when it is older than `ttl`
+        (stale-while-revalidate); stale pages are refreshed in the background
+        so the next call sees fresh data.
+        
+        Args:
+            url: URL of the page
+            ttl: Seconds the cached page is considered fresh
+            force_refresh: If True, skip the cache and download the page
+        
+        Returns:
+            Parsed page
+        
+        Raises:
+            requests.RequestException: If the page has to be downloaded and the request fails
+            ParsingError: If the page cannot be parsed
+        """
+        if self._cache is not None and not force_refresh:
+            cached = self._cache.get(url)
+            if cached is not None:
+                if cached.age > ttl:
+                    self._schedule_refresh(url)
+                return parse_html(cached.content, cached.encoding)
+        
+        return self._download(url)
+    
+    def _download(self, url: str, timeout: Optional[float] = None) -> html.HtmlElement:
+        """Download and parse a page as it streams in, storing it in the response cache."""
+        response = self.session.get(url, stream=True, timeout=timeout)
+        try:
+            response.raise_for_status()
+        
+            chunks: Optional[list[bytes]] = [] if self._cache is not None else None
+            root = parse_html_stream(response, chunks)
+            
+            if self._cache is not None:
+                self._cache.set(url, b''.join(chunks), declared_encoding(response))
+            return root
+        finally:
+            response.close()
+    
+    def _schedule_refresh(self, url: str):
+        """Re-download a stale cached page in a background thread."""
+        with self._refresh_lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2)
+        
+        def refresh():
+            try:
+                self._download(url, timeout=self.REFRESH_TIMEOUT)
+            except (requests.RequestException, ParsingError) as e:
+                # Keep serving the stale copy; the next call will try again
+                logger.debug("Background refresh of %s failed: %s", url, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(url)
+        
+        self._refresh_executor.submit(refresh)
+    
+    def close(self):
+        """Wait for pending background refreshes and stop their worker threads."""
+        with self._refresh_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
     def get_all_classes(self, force_refresh: bool = False) -> list[LeaClass]:
         """
         Get all enrolled classes.
@@ -58,42 +254,71 @@ class LeaManager:
         Returns:
             List of LeaClass objects
             
+        Raises:
+            NetworkError: If the fetch fails (repeated without a request for
+                          CLASSES_FAILURE_TTL seconds after a failure)
+        
         Reference: omnivox-crawler/src/modules/lea/Lea.ts
         """
-        if self._classes_cache and not force_refresh:
-            return self._classes_cache
+        if not force_refresh:
+            now = time.monotonic()
+            if (self._classes_fetched_at is not None
+                    and now - self._classes_fetched_at < self.CLASSES_MEMORY_TTL):
+                return self._classes_cache
+            # Don't hammer the server again right after a failed fetch
+            if (self._classes_failed_at is not None
+                    and now - self._classes_failed_at < self.CLASSES_FAILURE_TTL):
+                raise NetworkError(
+                    f"Failed to fetch classes: {str(self._classes_error)}"
+                ) from self._classes_error
         
         try:
-            response = self.session.get(self.LEA_URL)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root = self._fetch_with_swr(self.LEA_URL, self.CLASSES_TTL, force_refresh)
             classes = []
             
             # Find all class cards
-            card_panels = soup.select('.card-panel')
-            
-            for card in card_panels:
+            for card in _CARDS(root):
                 try:
                     cls = self._parse_class_card(card)
                     classes.append(cls)
                 except Exception as e:
                     # Continue parsing other classes even if one fails
-                    print(f"Warning: Failed to parse class card: {e}")
+                    logger.warning("Failed to parse class card: %s", e)
                     continue
             
-            self._classes_cache = classes
+            self._cache_classes(classes)
             return classes
             
         except requests.RequestException as e:
-            raise NetworkError(f"Failed to fetch classes: {str(e)}")
+            self._classes_failed_at = time.monotonic()
+            self._classes_error = e
+            raise NetworkError(f"Failed to fetch classes: {str(e)}") from e
+    
+    def _cache_classes(self, classes: list[LeaClass]):
+        """
+        Store parsed classes along with the lookup tables used by get_class().
+        
+        Args:
+            classes: Classes parsed from the LEA page
+        """
+        self._classes_cache = classes
+        self._classes_fetched_at = time.monotonic()
+        self._classes_failed_at = None
+        self._classes_error = None
+        self._classes_by_code = {}
+        for cls in classes:
+            # Keep the first class of a code, like the linear search did
+            self._classes_by_code.setdefault(cls.code, cls)
+        self._teachers_upper = [(cls.teacher.upper(), cls) for cls in classes]
+        self._titles_upper = [(cls.title.upper(), cls) for cls in classes]
+        self._class_lookups = {}
     
     def _parse_class_card(self, card) -> LeaClass:
         """
         Parse a class card from HTML.
         
         Args:
-            card: BeautifulSoup element for class card
+            card: lxml element for class card
             
         Returns:
             LeaClass object
@@ -101,50 +326,30 @@ class LeaManager:
         Reference: omnivox-crawler/src/modules/lea/Lea.ts (lines 10-61)
         """
         # Extract code and title
-        title_elem = card.select_one('.card-panel-title')
-        if not title_elem:
+        code_title = _TITLE(card).strip()
+        if not code_title:
             raise ParsingError("Could not find class title")
         
-        code_title = title_elem.get_text(strip=True)
-        
         # Split into code and title (there's a special space character)
         parts = code_title.split(maxsplit=1)
         code = parts[0] if parts else ""
         title = parts[1] if len(parts) > 1 else ""
         
         # Extract section, schedule, and teacher
-        desc_elem = card.select_one('.card-panel-desc')
-        if desc_elem:
-            desc_text = desc_elem.get_text()
-            
-            # Parse section (between first "0" and " -")
-            section_start = desc_text.find('0')
-            section_end = desc_text.find(' -')
-            section = desc_text[section_start:section_end].strip() if section_start != -1 and section_end != -1 else ""
-            
-            # Parse schedule (between "- " and last ", ")
-            schedule_start = desc_text.find('- ') + 2
-            schedule_end = desc_text.rfind(', ')
-            schedule_text = desc_text[schedule_start:schedule_end] if schedule_start > 1 and schedule_end != -1 else ""
-            schedule = parse_schedule(schedule_text)
-            
-            # Parse teacher (after last ", ")
-            teacher = desc_text[schedule_end + 2:].strip() if schedule_end != -1 else ""
-        else:
-            section = ""
-            schedule = []
-            teacher = ""
+        # A missing description yields an empty string, which parses to empty fields
+        section, schedule_text, teacher = _split_description(_DESC(card))
+        schedule = parse_schedule(schedule_text)
         
         # Extract grades
         # Reference: archive/omnivox-crawler/src/modules/lea/Lea.ts lines 34-48
-        notes = card.select('.note-principale')
+        notes = [note.text_content().strip() for note in _NOTES(card)]
         grade = None
         average = None
         median = None
         
         # Grade is always in notes[0]
         if len(notes) > 0:
-            grade_text = notes[0].get_text(strip=True)
+            grade_text = notes[0]
             # Check if grade is empty (" -  " with special whitespace character)
             # TS: if (grade == " -  ") { grade = undefined; }
             if grade_text and grade_text not in ['-', ' - ', ' -  ']:
@@ -159,17 +364,17 @@ class LeaManager:
         #   median = parseInt(notes[2].text) || undefined;
         # }
         if len(notes) > 3:
-            average = safe_float(notes[2].get_text(strip=True))
-            median = safe_float(notes[3].get_text(strip=True))
+            average = safe_float(notes[2])
+            median = safe_float(notes[3])
         elif len(notes) > 1:
-            average = safe_float(notes[1].get_text(strip=True))
+            average = safe_float(notes[1])
             if len(notes) > 2:
-                median = safe_float(notes[2].get_text(strip=True))
+                median = safe_float(notes[2])
         
         # Extract document/assignment counts
-        files = card.select('.file-indicator-number')
-        distributed_documents = safe_int(files[0].get_text(strip=True)) if len(files) > 0 else 0
-        distributed_assignments = safe_int(files[1].get_text(strip=True)) if len(files) > 1 else 0
+        files = _FILES(card)
+        distributed_documents = safe_int(files[0].text_content()) if len(files) > 0 else 0
+        distributed_assignments = safe_int(files[1].text_content()) if len(files) > 1 else 0
         
         return LeaClass(
             code=code,
@@ -201,21 +406,37 @@ class LeaManager:
         Returns:
             LeaClass object if found, None otherwise
         """
-        if not self._classes_cache:
-            self.get_all_classes()
+        # Served from memory while the parsed classes are still fresh
+        self.get_all_classes()
         
         if teacher:
-            return next((c for c in self._classes_cache 
-                        if teacher.upper() in c.teacher.upper()), None)
+            return self._find_class('teacher', teacher, self._teachers_upper)
         if name:
-            return next((c for c in self._classes_cache 
-                        if name.upper() in c.title.upper()), None)
+            return self._find_class('name', name, self._titles_upper)
         if code:
-            return next((c for c in self._classes_cache 
-                        if c.code == code.upper()), None)
+            return self._classes_by_code.get(code.upper())
         
         return None
     
+    def _find_class(
+        self,
+        field: str,
+        query: str,
+        haystack: list[tuple[str, LeaClass]]
+    ) -> Optional[LeaClass]:
+        """
+        Return the first class whose upper-cased field contains the query.
+        
+        Results are memoized until the class list is replaced, so repeated
+        lookups of the same string skip the scan entirely.
+        """
+        key = (field, query)
+        lookups = self._class_lookups
+        if key not in lookups:
+            needle = query.upper()
+            lookups[key] = next((c for t, c in haystack if needle in t), None)
+        return lookups[key]
+    
     def get_class_document_summary(self, force_refresh: bool = False) -> list[ClassDocumentSummary]:
         """
         Get document summary for all classes.
@@ -232,26 +453,27 @@ class LeaManager:
             return self._document_summary_cache
         
         try:
-            response = self.session.get(self.DOCUMENT_SUMMARY_URL)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root = self._fetch_with_swr(self.DOCUMENT_SUMMARY_URL, self.DOCUMENT_SUMMARY_TTL, force_refresh)
             summaries = []
             
             # Find all rows with class document info
-            rows = soup.select('.itemDataGrid, .itemDataGridAltern')
-            
-            for row in rows:
-                a_elem = row.select_one('a')
-                if not a_elem:
+            for row in _SUMMARY_ROWS(root):
+                # One descent collects both the class link and the cells
+                a_elem = None
+                tds = []
+                for elem in row.iter('a', 'td'):
+                    if elem.tag == 'td':
+                        tds.append(elem)
+                    elif a_elem is None:
+                        a_elem = elem
+                if a_elem is None:
                     continue
-                
-                name = a_elem.get_text(strip=True)
+            
+                name = a_elem.text_content().strip()
                 href = a_elem.get('href', '')
                 
                 # Get available documents count (3rd td)
-                tds = row.select('td')
-                available_docs = tds[2].get_text(strip=True) if len(tds) > 2 else "0"
+                available_docs = tds[2].text_content().strip() if len(tds) > 2 else "0"
                 
                 summaries.append(ClassDocumentSummary(
                     name=name,
@@ -279,43 +501,38 @@ class LeaManager:
         """
         try:
             url = f"{self.BASE_URL}{href}"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            root = self._fetch_with_swr(url, self.DOCUMENTS_TTL)
             categories = []
             
             # Find all document categories
-            category_tables = soup.select('.CategorieDocumentEtudiant')
-            
-            for table in category_tables:
+            for table in _CATEGORY_TABLES(root):
                 documents = []
                 
                 # Parse each document row
-                rows = table.select('tr')
-                for row in rows:
-                    name_elem = row.select_one('.lblTitreDocumentDansListe')
-                    if not name_elem:
+                for row in _TABLE_ROWS(table):
+                    fields = first_by_id_or_class(_DOC_FIELDS(row))
+                    name_elem = fields.get(_DOC_NAME_CLASS)
+                    if name_elem is None:
                         continue
                     
-                    name = name_elem.get_text(strip=True)
+                    name = name_elem.text_content().strip()
                     
                     # Description cleaning: replace tabs, carriage returns, newlines with single newline
                     # TypeScript: let cleanRegex = RegExp("([\t\r\n]){1,}", "gm");
                     #             description = description.replace(cleanRegex, '\n');
-                    desc_elem = row.select_one('.divDescriptionDocumentDansListe')
-                    if desc_elem:
-                        description = desc_elem.get_text(strip=True)
+                    desc_elem = fields.get(_DOC_DESC_CLASS)
+                    if desc_elem is not None:
+                        description = desc_elem.text_content().strip()
                         # Replace 1+ occurrences of tab/CR/LF with single newline
-                        description = re.sub(r'[\t\r\n]+', '\n', description)
+                        description = _WS_CLEAN_RE.sub('\n', description)
                     else:
                         description = ""
                     
                     # Posted date: TypeScript gets text after "since" 
                     # posted = document.querySelector(".DocDispo")!.text.substring("since".length);
-                    posted_elem = row.select_one('.DocDispo')
-                    if posted_elem:
-                        posted_text = posted_elem.get_text(strip=True)
+                    posted_elem = fields.get(_DOC_POSTED_CLASS)
+                    if posted_elem is not None:
+                        posted_text = posted_elem.text_content().strip()
                         # Remove "since" prefix if present
                         posted = posted_text[len('since'):].strip() if posted_text.startswith('since') else posted_text
                     else:
@@ -323,8 +540,8 @@ class LeaManager:
                     
                     # Check if document has been viewed
                     # TypeScript: viewed = document.querySelector("#colonneEtoileVisualisation")!.childNodes.length == 1;
-                    viewed_elem = row.select_one('#colonneEtoileVisualisation')
-                    viewed = len(viewed_elem.contents) == 1 if viewed_elem else False
+                    viewed_elem = fields.get(_DOC_VIEWED_ID)
+                    viewed = _NODE_COUNT(viewed_elem) == 1 if viewed_elem is not None else False
                     
                     documents.append(Document(
                         name=name,
@@ -334,8 +551,8 @@ class LeaManager:
                     ))
                 
                 # Get category name
-                cat_name_elem = table.select_one('.boutonEnabled')
-                category_name = cat_name_elem.get_text(strip=True) if cat_name_elem else "Not categorized"
+                cat_name_elems = _CATEGORY_NAME(table)
+                category_name = cat_name_elems[0].text_content().strip() if cat_name_elems else "Not categorized"
                 
                 if documents:  # Only add category if it has documents
                     categories.append(Category(
@@ -347,3 +564,34 @@ class LeaManager:
             
         except requests.RequestException as e:
             raise NetworkError(f"Failed to fetch class documents: {str(e)}")
+    
+    def get_all_class_documents(
+        self,
+        summaries: Optional[list[ClassDocumentSummary]] = None,
+        max_workers: int = 8
+    ) -> dict[str, list[Category]]:
+        """
+        Get documents for several classes concurrently.
+        
+        Each class page is fetched in a thread pool over the shared session, so
+        the total wait is roughly one round trip instead of one per class.
+        
+        Args:
+            summaries: Classes to fetch (defaults to get_class_document_summary())
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Dict mapping class name to its list of Category objects
+            
+        Raises:
+            NetworkError: If any of the requests fails
+        """
+        if summaries is None:
+            summaries = self.get_class_document_summary()
+        
+        if not summaries:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda s: self.get_class_documents_by_href(s.href), summaries)
+            return {summary.name: categories for summary, categories in zip(summaries, results)}
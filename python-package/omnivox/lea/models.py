@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class LeaClass:
     """
     Represents a class in LEA.
@@ -26,7 +26,7 @@ class LeaClass:
         return f"LeaClass(code='{self.code}', title='{self.title}', grade={self.grade})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Represents a document in LEA.
@@ -43,7 +43,7 @@ class Document:
         return f"Document({status} '{self.name}', posted: {self.posted})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """
     Represents a category of documents in LEA.
@@ -57,7 +57,7 @@ class Category:
         return f"Category('{self.name}', {len(self.documents)} documents)"
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassDocumentSummary:
     """
     Represents a summary of documents for a class.
@@ -2,14 +2,101 @@
 
 import re
 import requests
-from bs4 import BeautifulSoup
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from itertools import starmap
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 from typing import Optional
 
+from ..auth import create_http_adapter
 from ..exceptions import NetworkError, ParsingError, NotFoundError
-from ..utils import decode_html_entities, remove_extra_whitespace
+from ..utils import (
+    _TAG_RE, remove_extra_whitespace, xpath_has_class, first_by_id_or_class,
+    declared_encoding, parse_html, parse_html_stream
+)
 from .models import Mio, MioPreview, SearchUser
 
 
+# Checkbox ids (pattern: chk + 37 chars) counted to validate the row scan; the group drops "chk"
+_MESSAGE_ID_RE = re.compile(rb'chk(.{37})', re.IGNORECASE)
+
+# One inbox row: checkbox id, then the .name cell, then the first div of .lsTdTitle
+_PREVIEW_ROW_RE = re.compile(
+    rb'chk(?P<id>[^\n]{37})'
+    rb'.*?class="(?:[^"]*\s)?name(?:\s[^"]*)?"[^>]*>(?P<author>[^<]*)<'
+    rb'.*?class="(?:[^"]*\s)?lsTdTitle(?:\s[^"]*)?"[^>]*>\s*<div[^>]*>(?P<desc>.*?)</div>',
+    re.IGNORECASE | re.DOTALL
+)
+_EM_RE = re.compile(rb'<em[^>]*>(.*?)</em>', re.IGNORECASE | re.DOTALL)
+
+# Inbox rows, read from the parsed tree when the row scan can't be used
+_CHECKBOX_IDS = etree.XPath("//input[starts-with(@id, 'chk')]/@id")
+_AUTHORS = etree.XPath(f"//*[{xpath_has_class('name')}]")
+# Title cells are found once; their <div>/<em> children are read by walking the cell
+_TITLE_CELLS = etree.XPath(f"//*[{xpath_has_class('lsTdTitle')}]")
+
+# All fields of a message page (body, sender, recipients, subject, date) in one walk
+_CONTENT_ID = 'contenuWrapper'
+_TO_ID = 'tdACont'
+_FROM_CLASS = 'cDe'
+_SUBJECT_CLASS = 'cSujet'
+_DATE_CLASS = 'cDate'
+_DETAIL_FIELDS = etree.XPath(
+    f"//*[@id='{_CONTENT_ID}' or @id='{_TO_ID}' or {xpath_has_class(_FROM_CLASS)}"
+    f" or {xpath_has_class(_SUBJECT_CLASS)} or {xpath_has_class(_DATE_CLASS)}]"
+)
+
+
+def _scan_previews(content: bytes, encoding: Optional[str]) -> Optional[list[MioPreview]]:
+    """
+    Read inbox previews straight from the raw page with one regex scan.
+    
+    Args:
+        content: Raw inbox page
+        encoding: Charset declared by the server, if any
+    
+    Returns:
+        List of MioPreview objects, or None when the page must be parsed
+        instead: the rows don't match the expected markup, or no charset was
+        declared and only the parser can find it in the page's <meta> tag
+    """
+    if encoding is None:
+        return None
+    
+    previews = []
+    for row in _PREVIEW_ROW_RE.finditer(content):
+        title = _EM_RE.search(row['desc'])
+        # The author capture can't contain tags, so only entities need decoding
+        author = unescape(row['author'].decode(encoding, errors='replace')).strip()
+        if not title or not author:
+            return None
+        # Drop tags then decode entities, giving the same text as text_content()
+        # so both paths build identical previews
+        desc = row['desc'].decode(encoding, errors='replace')
+        previews.append(MioPreview(
+            id=row['id'].decode('ascii', errors='replace'),
+            author=sys.intern(author),
+            title=unescape(_TAG_RE.sub('', title[1].decode(encoding, errors='replace'))).strip(),
+            short_desc=remove_extra_whitespace(unescape(_TAG_RE.sub('', desc)))
+        ))
+    
+    # Rows spanning more than one checkbox mean the lazy scan skipped something
+    if len(previews) != len(_MESSAGE_ID_RE.findall(content)):
+        return None
+    return previews
+
+
+def _field_text(fields: dict[str, html.HtmlElement], key: str) -> str:
+    """Return the stripped text of a collected field, or "" if it is missing."""
+    elem = fields.get(key)
+    return elem.text_content().strip() if elem is not None else ""
+
+
 class MioManager:
     """
     Manager for MIO (Internal Messaging) operations.
@@ -29,6 +116,9 @@ class MioManager:
     MIO_LIST_URL = f"{MIO_URL}/Commun/Message/MioListe.aspx"
     MIO_DETAIL_URL = f"{MIO_URL}/Commun/Message/MioDetail.aspx"
     
+    # Most recently read messages kept in memory
+    MESSAGE_CACHE_SIZE = 256
+    
     def __init__(self, session: requests.Session):
         """
         Initialize MIO Manager.
@@ -37,7 +127,8 @@ class MioManager:
             session: Authenticated requests session
         """
         self.session = session
-        self._cached_messages: dict[str, Mio] = {}
+        self._cached_messages: OrderedDict[str, Mio] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._initialize()
     
     def _initialize(self):
@@ -46,16 +137,34 @@ class MioManager:
         
         Reference: omnivox-crawler/src/modules/MioCookie.ts
         """
+        self._configure_session()
+        
         try:
             # Get MIO authentication cookies
             self.session.get(self.MIO_LOGIN_URL)
         except requests.RequestException as e:
             raise NetworkError(f"Failed to initialize MIO session: {str(e)}")
     
+    def _configure_session(self):
+        """
+        Make sure MIO requests use pooled keep-alive connections with retries.
+        
+        Sessions created by OmnivoxAuth are already set up; a plain
+        requests.Session (no retries) gets the same adapter for the MIO host.
+        """
+        adapter = self.session.get_adapter(self.BASE_URL)
+        if isinstance(adapter, HTTPAdapter) and not adapter.max_retries.total:
+            self.session.mount(self.BASE_URL, create_http_adapter())
+        # Compressed pages are a fraction of the size; br is offered when brotli is installed
+        self.session.headers.setdefault('Accept-Encoding', make_headers(accept_encoding=True)['accept-encoding'])
+    
     def get_message_previews(self) -> list[MioPreview]:
         """
         Get list of message previews (inbox).
         
+        The rows are first read with one regex scan of the raw page; the page
+        is only parsed into a tree when its markup doesn't match.
+        
         Returns:
             List of MioPreview objects (up to 50 recent messages)
             
@@ -65,39 +174,35 @@ class MioManager:
             response = self.session.get(self.MIO_LIST_URL)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            previews = []
+            # Usual inbox markup: a single regex pass, no tree at all
+            previews = _scan_previews(response.content, declared_encoding(response))
+            if previews is not None:
+                return previews
+            
+            root = parse_html(response.content, declared_encoding(response))
             
-            # Extract message IDs from checkboxes (pattern: chk + 37 chars)
+            # Extract message IDs from the checkboxes of the parsed tree
             # TypeScript: let idRegex: RegExp = new RegExp("chk.{37}", 'gm');
             # ids = [...request.data.matchAll(idRegex)].map(match => match[0].substring(3));
-            id_pattern = re.compile(r'chk.{37}', re.IGNORECASE | re.MULTILINE)
-            id_matches = id_pattern.findall(response.text)
-            ids = [match[3:] for match in id_matches]  # Remove "chk" prefix (first 3 chars)
+            ids = [checkbox_id[3:] for checkbox_id in _CHECKBOX_IDS(root)]
             
-            # Extract authors
-            authors = [elem.get_text(strip=True) for elem in soup.select('.name')]
+            # Extract authors; a handful of senders repeat across the inbox, so
+            # interning makes those previews share one string each
+            authors = [sys.intern(elem.text_content().strip()) for elem in _AUTHORS(root)]
             
-            # Extract titles
-            title_divs = soup.select('.lsTdTitle > div > em')
-            titles = [elem.get_text(strip=True) for elem in title_divs]
+            # Extract titles (.lsTdTitle > div > em) and short descriptions
+            # (.lsTdTitle > div) from the direct children of each title cell
+            titles = []
+            short_descs = []
+            for cell in _TITLE_CELLS(root):
+                for div in cell.iterchildren('div'):
+                    short_descs.append(remove_extra_whitespace(div.text_content()))
+                    titles.extend(em.text_content().strip() for em in div.iterchildren('em'))
             
-            # Extract short descriptions
-            desc_divs = soup.select('.lsTdTitle > div')
-            short_descs = [remove_extra_whitespace(elem.get_text(strip=True)) for elem in desc_divs]
-            
-            # Combine into MioPreview objects
+            # Combine into MioPreview objects (zip stops at the shortest list)
             # TypeScript loop: for (let i = 0; i < ids[i].length; i++)
             # This looks like a bug in TS (should be ids.length), but we'll match the intent
-            for i in range(min(len(ids), len(authors), len(titles), len(short_descs))):
-                previews.append(MioPreview(
-                    id=ids[i],
-                    author=authors[i],
-                    title=titles[i],
-                    short_desc=short_descs[i]
-                ))
-            
-            return previews
+            return list(starmap(MioPreview, zip(ids, authors, titles, short_descs)))
             
         except requests.RequestException as e:
             raise NetworkError(f"Failed to fetch message previews: {str(e)}")
@@ -118,51 +223,88 @@ class MioManager:
         Reference: archive/omnivox-crawler/src/modules/MioDetail.ts
         """
         # Check cache first
-        if message_id in self._cached_messages:
-            return self._cached_messages[message_id]
+        with self._cache_lock:
+            if message_id in self._cached_messages:
+                self._cached_messages.move_to_end(message_id)
+                return self._cached_messages[message_id]
         
         try:
             url = f"{self.MIO_DETAIL_URL}?m={message_id}"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # The message page is parsed while it downloads
+            response = self.session.get(url, stream=True)
+            try:
+                response.raise_for_status()
+                root = parse_html_stream(response)
+            finally:
+                response.close()
             
             # Check if message exists
             # TypeScript: if (!contenuWrapper) { throw new Error("mio not found") };
-            content_wrapper = soup.select_one('#contenuWrapper')
-            if not content_wrapper:
+            fields = first_by_id_or_class(_DETAIL_FIELDS(root))
+            content_wrapper = fields.get(_CONTENT_ID)
+            if content_wrapper is None:
                 raise NotFoundError(f"Message {message_id} not found")
             
             # Extract message content
             # TypeScript: let messageBody = root.querySelector("#contenuWrapper")!.text;
             #             messageBody = removeSpaces(messageBody);
-            content = content_wrapper.get_text(strip=True)
-            content = remove_extra_whitespace(content)
+            content = remove_extra_whitespace(content_wrapper.text_content())
             
             # Extract metadata - TypeScript uses .textContent for these
             # const from: string = root.querySelector(".cDe")!.textContent;
-            from_elem = soup.select_one('.cDe')
-            to_elem = soup.select_one('#tdACont')
-            title_elem = soup.select_one('.cSujet')
-            date_elem = soup.select_one('.cDate')
-            
             mio = Mio(
                 id=message_id,
-                author=from_elem.get_text(strip=True) if from_elem else "",
-                recipient=to_elem.get_text(strip=True) if to_elem else "",
-                title=title_elem.get_text(strip=True) if title_elem else "",
-                date=date_elem.get_text(strip=True) if date_elem else "",
+                author=sys.intern(_field_text(fields, _FROM_CLASS)),
+                recipient=sys.intern(_field_text(fields, _TO_ID)),
+                title=_field_text(fields, _SUBJECT_CLASS),
+                date=_field_text(fields, _DATE_CLASS),
                 content=content
             )
             
-            # Cache the message
-            self._cached_messages[message_id] = mio
+            # Cache the message, evicting the least recently used one when full
+            with self._cache_lock:
+                self._cached_messages[message_id] = mio
+                self._cached_messages.move_to_end(message_id)
+                if len(self._cached_messages) > self.MESSAGE_CACHE_SIZE:
+                    self._cached_messages.popitem(last=False)
             return mio
             
         except requests.RequestException as e:
             raise NetworkError(f"Failed to fetch message: {str(e)}")
     
+    def get_messages_by_ids(self, message_ids: list[str], max_workers: int = 8) -> list[Mio]:
+        """
+        Get several full messages concurrently.
+        
+        Each message page is fetched in a thread pool over the shared session,
+        so reading a whole inbox costs roughly one round trip per batch instead
+        of one per message. Already cached messages are not fetched again.
+        
+        Args:
+            message_ids: Message IDs (UUID format)
+            max_workers: Maximum number of concurrent requests
+        
+        Returns:
+            List of Mio objects, in the order of message_ids
+        
+        Raises:
+            NotFoundError: If any message is not found
+            NetworkError: If any of the requests fails
+        """
+        # Fetch each distinct ID once, even if it is listed several times
+        unique_ids = list(dict.fromkeys(message_ids))
+        if not unique_ids:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            messages = dict(zip(unique_ids, executor.map(self.get_message_by_id, unique_ids)))
+        return [messages[message_id] for message_id in message_ids]
+    
+    def clear_message_cache(self):
+        """Forget every message cached by get_message_by_id()."""
+        with self._cache_lock:
+            self._cached_messages.clear()
+    
     def search_users(self, name: str) -> list[SearchUser]:
         """
         Search for users by name.
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MioPreview:
     """
     Represents a preview of a message in MIO inbox.
@@ -20,7 +20,7 @@ class MioPreview:
         return f"MioPreview(from='{self.author}', title='{self.title}')"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Mio:
     """
     Represents a complete message in MIO.
@@ -38,7 +38,7 @@ class Mio:
         return f"Mio(from='{self.author}', title='{self.title}', date='{self.date}')"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchUser:
     """
     Represents a user from MIO search results.
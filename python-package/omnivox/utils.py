@@ -1,7 +1,124 @@
 """Utility functions for HTML parsing and data manipulation."""
 
 import re
-from typing import Optional
+from html import unescape
+from lxml import etree, html as lxml_html
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from .exceptions import ParsingError
+
+if TYPE_CHECKING:
+    import requests
+
+
+# Bytes read from the socket per parser feed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Pre-compiled patterns shared by the helpers below
+_TAG_RE = re.compile(r'<[^>]*>')
+# String.fromCharCode(160) is non-breaking space (\xa0)
+_WHITESPACE_RE = re.compile(r' {2,}|\xa0{2,}')
+# Tags, whitespace runs and &nbsp; together, so an HTML fragment is cleaned in one scan.
+# Entities count towards the runs they decode into: &nbsp; becomes a plain space,
+# &#160; a non-breaking one
+_CLEAN_RE = re.compile(r'<[^>]*>|(?: |&nbsp;){2,}|(?:\xa0|&#160;|&#[xX][aA]0;){2,}|&nbsp;')
+
+
+def xpath_has_class(name: str) -> str:
+    """
+    Build an XPath predicate matching elements that carry the CSS class `name`.
+    
+    Compiled into an etree.XPath, the predicate is evaluated by libxml2 in
+    place of the CSS selectors used by the TypeScript implementation.
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def first_by_id_or_class(elems: Iterable[lxml_html.HtmlElement]) -> dict[str, lxml_html.HtmlElement]:
+    """
+    Index elements by their id and each of their class names.
+    
+    Lets one XPath walk collect several fields of a page, each then looked up by key.
+    
+    Args:
+        elems: Elements in document order
+        
+    Returns:
+        Dict mapping each id or class name to the first element carrying it
+    """
+    fields = {}
+    for elem in elems:
+        elem_id = elem.get('id')
+        if elem_id:
+            fields.setdefault(elem_id, elem)
+        for name in elem.get('class', '').split():
+            fields.setdefault(name, elem)
+    return fields
+
+
+def declared_encoding(response: 'requests.Response') -> Optional[str]:
+    """Return the charset declared in the Content-Type header, if any."""
+    content_type = response.headers.get('Content-Type', '')
+    return response.encoding if 'charset=' in content_type.lower() else None
+
+
+def _empty_document() -> lxml_html.HtmlElement:
+    """Build the tree of a page with no content, on which every lookup finds nothing."""
+    return lxml_html.document_fromstring('<html><body></body></html>')
+
+
+def parse_html(content: bytes, encoding: Optional[str] = None) -> lxml_html.HtmlElement:
+    """
+    Parse a raw HTML page into an lxml tree.
+    
+    The bytes are handed to libxml2 directly, decoded with `encoding` when the
+    server declared one. An empty body gives an empty document, so callers see
+    a page without results rather than an error.
+    
+    Raises:
+        ParsingError: If the page cannot be parsed
+    """
+    if not content.strip():
+        return _empty_document()
+    try:
+        return lxml_html.fromstring(content, parser=lxml_html.HTMLParser(encoding=encoding))
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError) as e:
+        raise ParsingError(f"Failed to parse page: {str(e)}")
+
+
+def parse_html_stream(
+    response: 'requests.Response',
+    chunks: Optional[list[bytes]] = None
+) -> lxml_html.HtmlElement:
+    """
+    Parse a streamed HTML response while its body is being downloaded.
+    
+    Chunks are fed to lxml's incremental parser as they arrive, so parsing
+    overlaps the transfer and the body is never buffered as one str.
+    
+    As with parse_html(), an empty body gives an empty document.
+    
+    Args:
+        response: Response opened with stream=True
+        chunks: Optional list collecting the raw chunks (e.g. for caching)
+    
+    Raises:
+        ParsingError: If the page cannot be parsed
+    """
+    parser = lxml_html.HTMLParser(encoding=declared_encoding(response))
+    empty = True
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+            empty = empty and not chunk.strip()
+            if chunks is not None:
+                chunks.append(chunk)
+        # Whitespace alone leaves the parser without a document to close
+        if empty:
+            return _empty_document()
+        return parser.close()
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError) as e:
+        raise ParsingError(f"Failed to parse page: {str(e)}")
 
 
 def decode_html_entities(text: str) -> str:
@@ -17,17 +134,14 @@ def decode_html_entities(text: str) -> str:
     if not text or not isinstance(text, str):
         return ""
     
-    # Remove HTML tags
-    text = re.sub(r'<[^>]*>', '', text)
+    # Remove HTML tags; plain text (the usual case) skips both passes
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' not in text:
+        return text
     
-    # Decode common HTML entities
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('&quot;', '"')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    
-    return text
+    # Decode every named/numeric entity in one pass; &nbsp; stays a plain space
+    return unescape(text.replace('&nbsp;', ' '))
 
 
 def remove_extra_whitespace(text: str) -> str:
@@ -44,42 +158,78 @@ def remove_extra_whitespace(text: str) -> str:
         text: Text to clean
         
     Returns:
-        Text with normalized whitespace
+        Text with normalized whitespace, stripped at both ends
         
     Reference: archive/omnivox-crawler/src/utils/HTMLDecoder.ts
     """
-    # String.fromCharCode(160) is non-breaking space (\xa0)
+    if not text:
+        return ""
+    
     # Replace 2+ regular spaces OR 2+ non-breaking spaces with newline
-    pattern = re.compile(r' {2,}|\xa0{2,}', re.MULTILINE)
-    return pattern.sub('\n', text)
+    return _WHITESPACE_RE.sub('\n', text).strip()
+
+
+def _clean_match(match: re.Match) -> str:
+    """Drop a matched tag, keep &nbsp; as a space, turn a whitespace run into a newline."""
+    found = match.group(0)
+    if found[0] == '<':
+        return ''
+    return ' ' if found == '&nbsp;' else '\n'
 
 
-def extract_k_token(html: str) -> Optional[str]:
+def clean_html_text(text: str) -> str:
+    """
+    Turn an HTML fragment into plain text.
+    
+    Equivalent to remove_extra_whitespace(decode_html_entities(text)).strip(),
+    except that tags and whitespace runs are handled by one regex pass, so
+    spaces on either side of a removed tag are not merged into one run.
+    
+    Args:
+        text: HTML text to clean
+    
+    Returns:
+        Decoded text without tags, whitespace runs replaced by newlines
+    """
+    if not text or not isinstance(text, str):
+        return ""
+    
+    return unescape(_CLEAN_RE.sub(_clean_match, text)).strip()
+
+
+def extract_k_token(html: Union[str, bytes]) -> Optional[str]:
     """
     Extract the 'k' authentication token from Omnivox login page HTML.
     
-    This matches the TypeScript logic exactly:
+    Follows the TypeScript logic with a single substring search, which also
+    works directly on the raw response bytes (no decoding needed):
     const init = answer.search("value=\"6") + "value=.".length;
     const k = answer.substring(init, init + 18);
+    The value is read up to its closing quote rather than sliced to 18 chars.
     
     Args:
-        html: HTML content of login page
+        html: HTML content of login page, as str or raw bytes
         
     Returns:
         The k token if found, None otherwise
         
     Reference: archive/omnivox-crawler/src/modules/Login.ts
     """
+    is_bytes = isinstance(html, bytes)
+    marker, quote = (b'value="6', b'"') if is_bytes else ('value="6', '"')
+    
     # Find the position of 'value="6' and add the length of 'value="' (7 chars)
-    init = html.find('value="6')
-    if init != -1:
-        init += len('value="')
-        k_token = html[init:init + 18]
-        # Verify it's actually 18 characters
-        if len(k_token) == 18:
-            return k_token
-    
-    return None
+    init = html.find(marker)
+    if init == -1:
+        return None
+    init += len(marker) - 1
+    end = html.find(quote, init)
+    
+    # A token is at least the 18 characters the TypeScript version reads
+    if end - init < 18:
+        return None
+    k_token = html[init:end]
+    return k_token.decode('ascii', errors='replace') if is_bytes else k_token
 
 
 def parse_schedule(schedule_text: str) -> list[str]:
@@ -26,17 +26,21 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     install_requires=requirements,
     extras_require={
+        # Lets urllib3 accept Brotli-compressed pages (Accept-Encoding: br)
+        "brotli": [
+            "brotli>=1.0.9",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.0.0",
+            "hypothesis>=6.0.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
@@ -10,12 +10,12 @@ import os
 
 
 def check_python_version():
-    """Check if Python version is 3.8+."""
+    """Check if Python version is 3.10+."""
     version = sys.version_info
     print(f"Python version: {version.major}.{version.minor}.{version.micro}")
     
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
-        print("❌ Python 3.8+ required!")
+    if version.major < 3 or (version.major == 3 and version.minor < 10):
+        print("❌ Python 3.10+ required!")
         return False
     
     print("✅ Python version OK")
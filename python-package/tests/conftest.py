@@ -0,0 +1,23 @@
+"""Fixtures shared by the test modules."""
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from .helpers import EMPTY_PAGE
+
+
+@pytest.fixture(scope="module")
+def shared_session():
+    """Build one mock session shared by every test in the module."""
+    return MagicMock(spec_set=requests.Session())
+
+
+@pytest.fixture
+def mock_session(shared_session):
+    """Hand each test the shared session with calls, side effects and cookies reset."""
+    shared_session.reset_mock(side_effect=True)
+    shared_session.cookies = requests.cookies.RequestsCookieJar()
+    # Mock the initialization GET request
+    shared_session.get.return_value = EMPTY_PAGE
+    return shared_session
@@ -0,0 +1,34 @@
+"""Helpers and sample data shared by the test modules."""
+
+from dataclasses import fields
+from pathlib import Path
+from types import SimpleNamespace
+
+from hypothesis import strategies as st
+
+
+# Saved Omnivox pages, replayed from disk instead of fetched
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+# Posting date shown on the saved pages; the models keep dates as plain strings
+FROZEN_DATE = "2024-01-15"
+
+
+def html_response(content: bytes) -> SimpleNamespace:
+    """Build a stand-in response serving `content` as UTF-8 HTML, whole or streamed."""
+    return SimpleNamespace(
+        headers={'Content-Type': 'text/html; charset=utf-8'},
+        encoding='utf-8',
+        content=content,
+        iter_content=lambda chunk_size=1: iter((content,)),
+        raise_for_status=lambda: None,
+        close=lambda: None,
+    )
+
+
+EMPTY_PAGE = html_response(b'<html><body></body></html>')
+
+
+def model_strategy(model) -> st.SearchStrategy:
+    """Build instances of a dataclass model with every field drawn from its annotation."""
+    return st.builds(model, **{f.name: st.from_type(f.type) for f in fields(model)})
@@ -1,100 +1,148 @@
 """Tests for authentication module."""
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+import os
+import tempfile
+import pytest
+import requests
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from http.cookiejar import LWPCookieJar
 from omnivox.auth import OmnivoxAuth
+from omnivox.lea.manager import LeaManager
 from omnivox.exceptions import AuthenticationError, NetworkError
 
 
-class TestOmnivoxAuth(unittest.TestCase):
+@pytest.fixture(scope="module")
+def auth_with_mock_session():
+    """Build one OmnivoxAuth wired to a mock session, shared by the module."""
+    mock_session_instance = MagicMock(spec_set=requests.Session())
+    auth = OmnivoxAuth(session=mock_session_instance)
+    return auth, mock_session_instance
+
+
+@pytest.fixture
+def auth(auth_with_mock_session):
+    """Hand each test the shared auth, logged out and with a clean mock session."""
+    auth, mock_session_instance = auth_with_mock_session
+    mock_session_instance.reset_mock(return_value=True, side_effect=True)
+    auth._authenticated = False
+    auth._session_restored = False
+    return auth, mock_session_instance
+
+
+def mock_response(content: bytes) -> SimpleNamespace:
+    """Build a stand-in response whose body is `content`."""
+    return SimpleNamespace(content=content, raise_for_status=lambda: None)
+
+
+class TestOmnivoxAuth:
     """Test cases for OmnivoxAuth class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.auth = OmnivoxAuth()
-    
-    @patch('omnivox.auth.requests.Session')
-    def test_successful_login(self, mock_session):
+    def test_successful_login(self, auth):
         """Test successful login flow."""
-        # Mock responses
-        mock_get_response = Mock()
-        mock_get_response.text = 'value="6123456789012345678"'
-        mock_get_response.raise_for_status = Mock()
+        auth, mock_session_instance = auth
+        mock_session_instance.get.return_value = mock_response(b'value="6123456789012345678"')
+        mock_session_instance.post.return_value = mock_response(
+            b'<div class="headerNavbarLink">Success</div>'
+        )
         
-        mock_post_response = Mock()
-        mock_post_response.text = '<div class="headerNavbarLink">Success</div>'
-        mock_post_response.raise_for_status = Mock()
-        
-        # Configure session mock
-        mock_session_instance = MagicMock()
-        mock_session_instance.get.return_value = mock_get_response
-        mock_session_instance.post.return_value = mock_post_response
-        mock_session.return_value = mock_session_instance
-        
-        # Create new auth instance with mocked session
-        auth = OmnivoxAuth()
-        auth.session = mock_session_instance
-        
-        # Test login
         result = auth.login("1234567", "password")
         
-        self.assertTrue(result)
-        self.assertTrue(auth.is_authenticated)
+        assert result
+        assert auth.is_authenticated
     
-    @patch('omnivox.auth.requests.Session')
-    def test_failed_login_invalid_credentials(self, mock_session):
+    def test_failed_login_invalid_credentials(self, auth):
         """Test login failure with invalid credentials."""
-        # Mock responses
-        mock_get_response = Mock()
-        mock_get_response.text = 'value="6123456789012345678"'
-        mock_get_response.raise_for_status = Mock()
-        
-        mock_post_response = Mock()
-        mock_post_response.text = '<div>Login failed</div>'
-        mock_post_response.raise_for_status = Mock()
+        auth, mock_session_instance = auth
+        mock_session_instance.get.return_value = mock_response(b'value="6123456789012345678"')
+        mock_session_instance.post.return_value = mock_response(b'<div>Login failed</div>')
         
-        # Configure session mock
-        mock_session_instance = MagicMock()
-        mock_session_instance.get.return_value = mock_get_response
-        mock_session_instance.post.return_value = mock_post_response
-        mock_session.return_value = mock_session_instance
-        
-        # Create new auth instance with mocked session
-        auth = OmnivoxAuth()
-        auth.session = mock_session_instance
-        
-        # Test login
-        with self.assertRaises(AuthenticationError):
+        with pytest.raises(AuthenticationError):
             auth.login("invalid", "credentials")
         
-        self.assertFalse(auth.is_authenticated)
+        assert not auth.is_authenticated
     
-    @patch('omnivox.auth.requests.Session')
-    def test_failed_login_missing_token(self, mock_session):
+    def test_failed_login_missing_token(self, auth):
         """Test login failure when k token is not found."""
-        # Mock responses
-        mock_get_response = Mock()
-        mock_get_response.text = '<html>No token here</html>'
-        mock_get_response.raise_for_status = Mock()
+        auth, mock_session_instance = auth
+        mock_session_instance.get.return_value = mock_response(b'<html>No token here</html>')
         
-        # Configure session mock
-        mock_session_instance = MagicMock()
-        mock_session_instance.get.return_value = mock_get_response
-        mock_session.return_value = mock_session_instance
+        with pytest.raises(AuthenticationError):
+            auth.login("1234567", "password")
         
-        # Create new auth instance with mocked session
-        auth = OmnivoxAuth()
-        auth.session = mock_session_instance
+        mock_session_instance.post.assert_not_called()
+    
+    def test_login_skipped_with_valid_saved_cookies(self):
+        """Test that restored cookies with a live session skip the login POST."""
+        mock_session_instance = MagicMock(spec_set=requests.Session())
+        mock_session_instance.get.return_value = mock_response(
+            b'<div class="headerNavbarLink">Welcome back</div>'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            auth = OmnivoxAuth(
+                cookie_jar_path=os.path.join(tmpdir, "cookies.txt"),
+                session=mock_session_instance
+            )
+            
+            result = auth.login("1234567", "password")
+        
+        assert result
+        assert auth.is_authenticated
+        assert auth.session_restored
+        mock_session_instance.post.assert_not_called()
+    
+    def test_cookies_saved_after_login(self):
+        """Test that the cookie jar is written after a successful login."""
+        mock_session_instance = MagicMock(spec_set=requests.Session())
+        mock_session_instance.get.return_value = mock_response(b'value="6123456789012345678"')
+        mock_session_instance.post.return_value = mock_response(
+            b'<div class="headerNavbarLink">Success</div>'
+        )
         
-        # Test login
-        with self.assertRaises(AuthenticationError):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cookies.txt")
+            auth = OmnivoxAuth(cookie_jar_path=path, session=mock_session_instance)
+            
             auth.login("1234567", "password")
+            
+            assert os.path.exists(path)
     
-    def test_get_session_when_not_authenticated(self):
+    def test_expired_saved_cookies_not_reused_after_fresh_login(self):
+        """Test that LEA cookies from an expired saved session are fetched again."""
+        mock_session_instance = MagicMock(spec_set=requests.Session())
+        mock_session_instance.get.return_value = mock_response(b'value="6123456789012345678"')
+        mock_session_instance.post.return_value = mock_response(
+            b'<div class="headerNavbarLink">Success</div>'
+        )
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cookies.txt")
+            jar = LWPCookieJar(path)
+            jar.set_cookie(requests.cookies.create_cookie(
+                "ASP.NET_SessionId", "expired", domain=LeaManager.LEA_COOKIE_DOMAIN
+            ))
+            jar.save(ignore_discard=True)
+            
+            auth = OmnivoxAuth(cookie_jar_path=path, session=mock_session_instance)
+            auth.login("1234567", "password")
+            LeaManager(auth.get_session(), reuse_cookies=auth.session_restored)
+        
+        assert not auth.session_restored
+        mock_session_instance.get.assert_called_with(LeaManager.LEA_COOKIE_URL)
+    
+    def test_uses_provided_session(self):
+        """Test that an injected session is configured and used for login."""
+        session = requests.Session()
+        auth = OmnivoxAuth(session=session)
+        
+        assert auth.session is session
+        assert session.get_adapter(OmnivoxAuth.LOGIN_URL).max_retries.total == 3
+        assert 'Mozilla' in session.headers['User-Agent']
+    
+    def test_get_session_when_not_authenticated(self, auth):
         """Test getting session when not authenticated."""
-        with self.assertRaises(AuthenticationError):
-            self.auth.get_session()
-
-
-if __name__ == '__main__':
-    unittest.main()
+        auth, _ = auth
+        
+        with pytest.raises(AuthenticationError):
+            auth.get_session()
@@ -0,0 +1,42 @@
+"""Tests for the on-disk response cache."""
+
+import os
+import tempfile
+from omnivox.cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.cache = ResponseCache(self.path, namespace="1234567")
+    
+    def teardown_method(self):
+        """Close the cache and remove its directory."""
+        self.cache.close()
+        self.tmpdir.cleanup()
+    
+    def test_set_and_get(self):
+        """Test storing and reading back a page."""
+        self.cache.set("https://example.com/a", b"<html>A</html>", "utf-8")
+        
+        cached = self.cache.get("https://example.com/a")
+        
+        assert cached.content == b"<html>A</html>"
+        assert cached.encoding == "utf-8"
+        assert cached.age < 60
+    
+    def test_get_missing(self):
+        """Test looking up a page that was never cached."""
+        assert self.cache.get("https://example.com/missing") is None
+    
+    def test_namespaces_are_isolated(self):
+        """Test that accounts sharing a file don't see each other's pages."""
+        self.cache.set("https://example.com/a", b"mine")
+        other = ResponseCache(self.path, namespace="7654321")
+        
+        assert other.get("https://example.com/a") is None
+        other.close()
@@ -1,89 +1,144 @@
 """Tests for OmnivoxClient."""
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
-from omnivox import OmnivoxClient
+import asyncio
+import threading
+import pytest
+from unittest.mock import DEFAULT, Mock, patch
+from omnivox import OmnivoxClient, AsyncOmnivoxClient
+from omnivox.lea.models import Category, ClassDocumentSummary
 from omnivox.exceptions import AuthenticationError
 
 
-class TestOmnivoxClient(unittest.TestCase):
+# Document summaries and the categories served for each href, built once
+_SUMMARIES = [
+    ClassDocumentSummary(name="Web Programming", available_documents="1", href="/a"),
+    ClassDocumentSummary(name="Databases", available_documents="2", href="/b"),
+]
+_CATEGORIES_BY_HREF = {
+    "/a": [Category(name="Lectures", documents=[])],
+    "/b": [Category(name="Labs", documents=[])],
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _patch_client_deps():
+    """Patch the client's collaborators once for the whole module."""
+    patches = patch.multiple(
+        'omnivox.client', OmnivoxAuth=DEFAULT, LeaManager=DEFAULT, MioManager=DEFAULT
+    )
+    mocks = patches.start()
+    yield mocks
+    patches.stop()
+
+
+@pytest.fixture
+def mocks(_patch_client_deps):
+    """Reset the patched classes and log in successfully by default."""
+    for mock in _patch_client_deps.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    
+    mock_auth_instance = _patch_client_deps['OmnivoxAuth'].return_value
+    mock_auth_instance.login.return_value = True
+    mock_auth_instance.is_authenticated = True
+    return _patch_client_deps
+
+
+@pytest.fixture
+def client(mocks):
+    """Build a client logged in through the patched OmnivoxAuth."""
+    return OmnivoxClient("1234567", "password")
+
+
+class TestOmnivoxClient:
     """Test cases for OmnivoxClient class."""
     
-    @patch('omnivox.client.OmnivoxAuth')
-    @patch('omnivox.client.LeaManager')
-    @patch('omnivox.client.MioManager')
-    def test_successful_initialization(self, mock_mio, mock_lea, mock_auth):
+    def test_successful_initialization(self, client, mocks):
         """Test successful client initialization."""
-        # Mock authentication
-        mock_auth_instance = Mock()
-        mock_auth_instance.login.return_value = True
-        mock_auth_instance.is_authenticated = True
-        mock_auth_instance.get_session.return_value = Mock()
-        mock_auth.return_value = mock_auth_instance
+        mock_auth_instance = mocks['OmnivoxAuth'].return_value
         
-        # Create client
-        client = OmnivoxClient("1234567", "password")
-        
-        # Verify
-        self.assertTrue(client.is_authenticated)
+        assert client.is_authenticated
         mock_auth_instance.login.assert_called_once_with("1234567", "password")
+        
+        # Managers are only created when first accessed
+        mocks['LeaManager'].assert_not_called()
+        mocks['MioManager'].assert_not_called()
     
-    @patch('omnivox.client.OmnivoxAuth')
-    def test_failed_initialization(self, mock_auth):
+    def test_failed_initialization(self, mocks):
         """Test client initialization with failed authentication."""
-        # Mock failed authentication
-        mock_auth_instance = Mock()
-        mock_auth_instance.login.return_value = False
-        mock_auth.return_value = mock_auth_instance
+        mocks['OmnivoxAuth'].return_value.login.return_value = False
         
         # Verify exception is raised
-        with self.assertRaises(AuthenticationError):
+        with pytest.raises(AuthenticationError):
             OmnivoxClient("invalid", "credentials")
     
-    @patch('omnivox.client.OmnivoxAuth')
-    @patch('omnivox.client.LeaManager')
-    @patch('omnivox.client.MioManager')
-    def test_lea_property(self, mock_mio, mock_lea, mock_auth):
-        """Test accessing LEA manager."""
-        # Mock authentication
-        mock_auth_instance = Mock()
-        mock_auth_instance.login.return_value = True
-        mock_auth_instance.is_authenticated = True
-        mock_auth_instance.get_session.return_value = Mock()
-        mock_auth.return_value = mock_auth_instance
+    @pytest.mark.parametrize("attr,manager,other", [
+        ("lea", "LeaManager", "MioManager"),
+        ("mio", "MioManager", "LeaManager"),
+    ])
+    def test_manager_property(self, client, mocks, attr, manager, other):
+        """Test that each manager is created once, on first access."""
+        instance = getattr(client, attr)
         
-        # Mock LEA manager
-        mock_lea_instance = Mock()
-        mock_lea.return_value = mock_lea_instance
+        assert instance is mocks[manager].return_value
+        assert getattr(client, attr) is instance
+        mocks[manager].assert_called_once()
+        mocks[other].assert_not_called()
+        # The cookies the new manager received are saved right away
+        mocks['OmnivoxAuth'].return_value.save_cookies.assert_called_once()
+    
+    def test_close_saves_cookies(self, client, mocks):
+        """Test that closing the client writes its cookies to the jar."""
+        client.close()
         
-        # Create client and access LEA
+        mocks['OmnivoxAuth'].return_value.save_cookies.assert_called_once()
+    
+    @pytest.mark.parametrize("restored", [True, False])
+    def test_lea_reuses_cookies_only_from_restored_session(self, mocks, restored):
+        """Test that LEA cookies from the jar are only reused if login resumed that session."""
+        mocks['OmnivoxAuth'].return_value.session_restored = restored
         client = OmnivoxClient("1234567", "password")
-        lea = client.lea
+        client.lea
         
-        self.assertEqual(lea, mock_lea_instance)
+        assert mocks['LeaManager'].call_args.kwargs['reuse_cookies'] is restored
     
-    @patch('omnivox.client.OmnivoxAuth')
-    @patch('omnivox.client.LeaManager')
-    @patch('omnivox.client.MioManager')
-    def test_mio_property(self, mock_mio, mock_lea, mock_auth):
-        """Test accessing MIO manager."""
-        # Mock authentication
-        mock_auth_instance = Mock()
-        mock_auth_instance.login.return_value = True
-        mock_auth_instance.is_authenticated = True
-        mock_auth_instance.get_session.return_value = Mock()
-        mock_auth.return_value = mock_auth_instance
-        
-        # Mock MIO manager
-        mock_mio_instance = Mock()
-        mock_mio.return_value = mock_mio_instance
+    def test_warm_up(self, client, mocks):
+        """Test creating both managers ahead of time."""
+        client.warm_up()
+        client.lea
+        client.mio
         
-        # Create client and access MIO
-        client = OmnivoxClient("1234567", "password")
-        mio = client.mio
-        
-        self.assertEqual(mio, mock_mio_instance)
+        mocks['LeaManager'].assert_called_once()
+        mocks['MioManager'].assert_called_once()
 
 
-if __name__ == '__main__':
-    unittest.main()
+class TestAsyncOmnivoxClient:
+    """Test cases for AsyncOmnivoxClient class."""
+    
+    def test_get_all_class_documents(self):
+        """Test fetching documents for several classes concurrently."""
+        mock_client = Mock(spec_set=OmnivoxClient)
+        mock_client.lea.get_class_document_summary.return_value = _SUMMARIES
+        mock_client.lea.get_class_documents_by_href.side_effect = _CATEGORIES_BY_HREF.__getitem__
+        
+        client = AsyncOmnivoxClient(mock_client)
+        documents = asyncio.run(client.get_all_class_documents())
+        
+        assert documents == {
+            "Web Programming": _CATEGORIES_BY_HREF["/a"],
+            "Databases": _CATEGORIES_BY_HREF["/b"],
+        }
+    
+    def test_manager_created_off_the_event_loop(self):
+        """Test that the lazy manager (and its cookie request) is built in a worker thread."""
+        threads = []
+        
+        class LazyClient:
+            @property
+            def lea(self):
+                threads.append(threading.current_thread())
+                return Mock(**{'get_all_classes.return_value': []})
+        
+        client = AsyncOmnivoxClient(LazyClient())
+        
+        assert asyncio.run(client.get_all_classes()) == []
+        assert threads and threads[0] is not threading.main_thread()
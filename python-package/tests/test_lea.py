@@ -1,126 +1,271 @@
 """Tests for LEA module."""
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+import logging
+import pytest
+import requests
+from dataclasses import fields
+from hypothesis import given, settings, strategies as st
+from unittest.mock import Mock, patch
+from omnivox.cache import CachedResponse, ResponseCache
+from omnivox.exceptions import NetworkError, ParsingError
 from omnivox.lea.manager import LeaManager
-from omnivox.lea.models import LeaClass, Document, Category
+from omnivox.lea.models import LeaClass, Document, Category, ClassDocumentSummary
+from omnivox.utils import parse_html
 
+from .helpers import FIXTURES, FROZEN_DATE, html_response, model_strategy
 
-class TestLeaManager(unittest.TestCase):
+
+LEA_PAGE_HTML = (FIXTURES / 'lea_page.html').read_bytes()
+DOCUMENTS_PAGE_HTML = (FIXTURES / 'lea_documents.html').read_bytes()
+SUMMARY_PAGE_HTML = (FIXTURES / 'lea_document_summary.html').read_bytes()
+
+# Fields of a class used by the lookup tests
+_SAMPLE_CLASS_FIELDS = {
+    "code": "420-3A4-DW",
+    "title": "Web Programming",
+    "teacher": "John Doe",
+    "section": "01",
+    "schedule": ["Mon 10:00-12:00"]
+}
+
+
+class TestLeaManager:
     """Test cases for LeaManager class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_session = MagicMock()
-        # Mock the initialization GET request
-        self.mock_session.get.return_value = Mock()
+    @classmethod
+    def setup_class(cls):
+        """Build the canned pages once; they are read-only and reused."""
+        cls.lea_page = html_response(LEA_PAGE_HTML)
+        cls.documents_page = html_response(DOCUMENTS_PAGE_HTML)
+        cls.summary_page = html_response(SUMMARY_PAGE_HTML)
+        # Parsed once for tests that don't exercise page parsing itself
+        cls.lea_tree = parse_html(LEA_PAGE_HTML)
     
-    @patch('omnivox.lea.manager.BeautifulSoup')
-    def test_get_all_classes(self, mock_bs):
+    def test_get_all_classes(self, mock_session):
         """Test getting all classes."""
         # Mock HTML response
-        mock_response = Mock()
-        mock_response.text = '<html>Mock LEA page</html>'
-        mock_response.raise_for_status = Mock()
-        self.mock_session.get.return_value = mock_response
-        
-        # Mock parsed HTML
-        mock_soup = Mock()
-        mock_card = Mock()
-        
-        # Mock card structure
-        title_elem = Mock()
-        title_elem.get_text.return_value = "420-3A4-DW Web Programming"
-        mock_card.select_one.side_effect = lambda sel: {
-            '.card-panel-title': title_elem,
-            '.card-panel-desc': None
-        }.get(sel)
-        
-        mock_card.select.return_value = []  # No grades
-        mock_soup.select.return_value = [mock_card]
-        mock_bs.return_value = mock_soup
+        mock_session.get.return_value = self.lea_page
         
         # Create manager and test
-        manager = LeaManager(self.mock_session)
+        manager = LeaManager(mock_session)
+        classes = manager.get_all_classes()
+        
+        assert isinstance(classes, list)
+        assert len(classes) == 1
+        cls = classes[0]
+        assert cls.code == "420-3A4-DW"
+        assert cls.title == "Web Programming"
+        assert cls.section == "00001"
+        assert cls.schedule == ["Mon 10:00-12:00", "Wed 14:00-16:00"]
+        assert cls.teacher == "John Doe"
+        assert cls.grade == "85.5%"
+        assert cls.average == 78.0
+        assert cls.median == 80.0
+        assert cls.distributed_documents == 2
+        assert cls.distributed_assignments == 1
+    
+    def test_get_all_classes_logs_malformed_card(self, mock_session, caplog):
+        """Test that a card failing to parse is logged and skipped."""
+        mock_session.get.return_value = self.lea_page
+        
+        manager = LeaManager(mock_session)
+        with patch('omnivox.lea.manager.parse_html_stream', return_value=self.lea_tree), \
+                patch.object(manager, '_parse_class_card', side_effect=ValueError("bad card")):
+            with caplog.at_level(logging.WARNING, logger='omnivox.lea.manager'):
+                classes = manager.get_all_classes()
+        
+        assert classes == []
+        assert "bad card" in caplog.records[0].getMessage()
+    
+    def test_get_class_documents_by_href(self, mock_session):
+        """Test getting the documents of a class."""
+        mock_session.get.return_value = self.documents_page
+        
+        manager = LeaManager(mock_session)
+        categories = manager.get_class_documents_by_href("/cvir/ddle/ListeDocuments.aspx")
+        
+        assert len(categories) == 1
+        assert categories[0].name == "Lectures"
+        doc = categories[0].documents[0]
+        assert doc.name == "Lecture 1 - Introduction"
+        assert doc.description == "First lecture slides"
+        assert doc.posted == FROZEN_DATE
+        assert doc.viewed
+    
+    def test_get_class_document_summary(self, mock_session):
+        """Test getting the document summary of every class."""
+        mock_session.get.return_value = self.summary_page
+        
+        manager = LeaManager(mock_session)
+        summaries = manager.get_class_document_summary()
+        
+        assert len(summaries) == 2
+        assert summaries[0].name == "Web Programming"
+        assert summaries[0].href == "ListeDocuments.aspx?C=1"
+        assert summaries[0].available_documents == "3"
+        assert summaries[1].name == "Databases"
+        assert summaries[1].available_documents == "0"
+    
+    def test_get_all_class_documents(self, mock_session):
+        """Test fetching documents for several classes at once."""
+        mock_session.get.return_value = self.documents_page
+        
+        manager = LeaManager(mock_session)
+        summaries = [
+            ClassDocumentSummary(name="Web Programming", available_documents="1", href="/a"),
+            ClassDocumentSummary(name="Databases", available_documents="1", href="/b"),
+        ]
+        documents = manager.get_all_class_documents(summaries, max_workers=2)
+        
+        assert set(documents) == {"Web Programming", "Databases"}
+        assert documents["Databases"][0].name == "Lectures"
+    
+    def test_stale_cached_page_is_served_and_refreshed(self, mock_session):
+        """Test stale-while-revalidate behaviour of the response cache."""
+        mock_session.get.return_value = self.lea_page
+        
+        mock_cache = Mock(spec_set=ResponseCache)
+        mock_cache.get.return_value = CachedResponse(
+            content=b'<html><body></body></html>', encoding=None, fetched_at=0.0
+        )
+        
+        manager = LeaManager(mock_session, cache=mock_cache)
         classes = manager.get_all_classes()
+        manager.close()
+        
+        # The stale (empty) page is returned right away...
+        assert classes == []
+        # ...and the fresh page is downloaded and stored in the background
+        mock_cache.set.assert_called_once_with(LeaManager.LEA_URL, LEA_PAGE_HTML, 'utf-8')
+        # The refresh can't hang its worker on an unresponsive server
+        assert mock_session.get.call_args.kwargs['timeout'] == LeaManager.REFRESH_TIMEOUT
+    
+    def test_failed_refresh_keeps_stale_page(self, mock_session, caplog):
+        """Test that a refresh whose page can't be parsed is logged and dropped."""
+        mock_cache = Mock(spec_set=ResponseCache)
+        mock_cache.get.return_value = CachedResponse(
+            content=b'<html><body></body></html>', encoding=None, fetched_at=0.0
+        )
+        
+        manager = LeaManager(mock_session, cache=mock_cache)
+        with caplog.at_level(logging.DEBUG, logger='omnivox.lea.manager'), \
+                patch('omnivox.lea.manager.parse_html_stream', side_effect=ParsingError("bad page")):
+            assert manager.get_all_classes() == []
+            manager.close()
         
-        self.assertIsInstance(classes, list)
+        mock_cache.set.assert_not_called()
+        assert "bad page" in caplog.text
     
-    def test_get_class_by_code(self):
+    def test_initialize_skipped_with_lea_cookie(self, mock_session):
+        """Test that a restored LEA cookie skips the cookie round trip."""
+        cookies = requests.cookies.RequestsCookieJar()
+        cookies.set("ASP.NET_SessionId", "abc", domain=LeaManager.LEA_COOKIE_DOMAIN)
+        mock_session.cookies = cookies
+        
+        LeaManager(mock_session, reuse_cookies=True)
+        
+        mock_session.get.assert_not_called()
+    
+    def test_initialize_ignores_lea_cookie_by_default(self, mock_session):
+        """Test that an LEA cookie already in the session isn't trusted by default."""
+        cookies = requests.cookies.RequestsCookieJar()
+        cookies.set("ASP.NET_SessionId", "abc", domain=LeaManager.LEA_COOKIE_DOMAIN)
+        mock_session.cookies = cookies
+        
+        LeaManager(mock_session)
+        
+        mock_session.get.assert_called_once()
+    
+    def test_get_all_classes_empty_body(self, mock_session):
+        """Test that an empty LEA response reads as a page without classes."""
+        manager = LeaManager(mock_session)
+        mock_session.get.return_value = html_response(b'')
+        
+        assert manager.get_all_classes() == []
+        assert manager.get_class_document_summary() == []
+    
+    def test_get_all_classes_kept_in_memory(self, mock_session):
+        """Test that an empty class list is cached rather than refetched."""
+        manager = LeaManager(mock_session)
+        manager.get_all_classes()
+        manager.get_all_classes()
+        
+        # One GET for the LEA cookie, one for the classes page
+        assert mock_session.get.call_count == 2
+    
+    def test_get_all_classes_failure_is_remembered(self, mock_session):
+        """Test that a failed fetch is not retried right away."""
+        manager = LeaManager(mock_session)
+        mock_session.get.side_effect = requests.ConnectionError("offline")
+        
+        with pytest.raises(NetworkError) as first:
+            manager.get_all_classes()
+        with pytest.raises(NetworkError) as second:
+            manager.get_class(code="420-3A4-DW")
+        
+        # Each call gets its own error, chained to the original failure
+        assert second.value is not first.value
+        assert second.value.__cause__ is first.value.__cause__
+        assert isinstance(second.value.__cause__, requests.ConnectionError)
+        
+        assert mock_session.get.call_count == 2
+    
+    def test_get_class_by_code(self, mock_session):
         """Test finding a class by code."""
-        manager = LeaManager(self.mock_session)
+        manager = LeaManager(mock_session)
         
         # Add mock class to cache
-        mock_class = LeaClass(
-            code="420-3A4-DW",
-            title="Web Programming",
-            teacher="John Doe",
-            section="01",
-            schedule=["Mon 10:00-12:00"]
-        )
-        manager._classes_cache = [mock_class]
+        mock_class = LeaClass(**_SAMPLE_CLASS_FIELDS)
+        manager._cache_classes([mock_class])
         
         # Test
         result = manager.get_class(code="420-3A4-DW")
         
-        self.assertIsNotNone(result)
-        self.assertEqual(result.code, "420-3A4-DW")
+        assert result is not None
+        assert result.code == "420-3A4-DW"
+        assert manager.get_class(code="420-3a4-dw") is mock_class
+        assert manager.get_class(teacher="doe") is mock_class
+        assert manager.get_class(name="web prog") is mock_class
+    
+    def test_get_class_lookups_reset_on_refresh(self, mock_session):
+        """Test that memoized lookups don't outlive the class list."""
+        manager = LeaManager(mock_session)
+        manager._cache_classes([])
+        assert manager.get_class(teacher="Doe") is None
+        
+        mock_class = LeaClass(**_SAMPLE_CLASS_FIELDS)
+        manager._cache_classes([mock_class])
+        
+        assert manager.get_class(teacher="Doe") is mock_class
     
-    def test_get_class_not_found(self):
+    def test_get_class_not_found(self, mock_session):
         """Test finding a class that doesn't exist."""
-        manager = LeaManager(self.mock_session)
-        manager._classes_cache = []
+        manager = LeaManager(mock_session)
+        manager._cache_classes([])
         
         result = manager.get_class(code="INVALID")
         
-        self.assertIsNone(result)
+        assert result is None
 
 
-class TestLeaModels(unittest.TestCase):
+class TestLeaModels:
     """Test cases for LEA data models."""
     
-    def test_lea_class_creation(self):
-        """Test creating a LeaClass object."""
-        cls = LeaClass(
-            code="420-3A4-DW",
-            title="Web Programming",
-            teacher="John Doe",
-            section="01",
-            schedule=["Mon 10:00-12:00", "Wed 14:00-16:00"],
-            grade="85.5%",
-            average=78.3,
-            median=80.0
-        )
+    @pytest.mark.parametrize("model", [LeaClass, Document, Category, ClassDocumentSummary])
+    @settings(max_examples=25, deadline=None)
+    @given(data=st.data())
+    def test_model_roundtrip(self, model, data):
+        """Test that models rebuilt from their fields compare and print the same."""
+        obj = data.draw(model_strategy(model))
+        copy = model(**{f.name: getattr(obj, f.name) for f in fields(model)})
         
-        self.assertEqual(cls.code, "420-3A4-DW")
-        self.assertEqual(cls.teacher, "John Doe")
-        self.assertEqual(len(cls.schedule), 2)
-    
-    def test_document_creation(self):
-        """Test creating a Document object."""
-        doc = Document(
-            name="Lecture 1 - Introduction",
-            description="First lecture slides",
-            posted="2024-01-15",
-            viewed=True
-        )
-        
-        self.assertEqual(doc.name, "Lecture 1 - Introduction")
-        self.assertTrue(doc.viewed)
+        assert copy == obj
+        assert repr(copy) == repr(obj)
     
-    def test_category_creation(self):
-        """Test creating a Category object."""
-        doc1 = Document("Doc 1", "Description 1", "2024-01-15", False)
-        doc2 = Document("Doc 2", "Description 2", "2024-01-16", True)
-        
-        category = Category(
-            name="Lectures",
-            documents=[doc1, doc2]
-        )
+    def test_document_uses_slots(self):
+        """Test that Document instances carry no per-instance __dict__."""
+        doc = Document("Doc 1", "Description 1", FROZEN_DATE, False)
         
-        self.assertEqual(category.name, "Lectures")
-        self.assertEqual(len(category.documents), 2)
-
-
-if __name__ == '__main__':
-    unittest.main()
+        assert not hasattr(doc, '__dict__')
+        with pytest.raises(AttributeError):
+            doc.unknown = True
@@ -1,161 +1,205 @@
 """Tests for MIO module."""
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+import pytest
+import requests
+from dataclasses import FrozenInstanceError, fields
+from hypothesis import given, settings, strategies as st
+from unittest.mock import patch
+from omnivox.exceptions import NotFoundError
 from omnivox.mio.manager import MioManager
 from omnivox.mio.models import Mio, MioPreview, SearchUser
+from omnivox.utils import parse_html
 
+from .helpers import FIXTURES, FROZEN_DATE, html_response, model_strategy
 
-class TestMioManager(unittest.TestCase):
+
+MIO_LIST_HTML = (FIXTURES / 'mio_list.html').read_bytes()
+MIO_DETAIL_HTML = (FIXTURES / 'mio_detail.html').read_bytes()
+
+# One entry of the MIO user search API response
+_SAMPLE_API_USER = {
+    "Numero": "1234567",
+    "Titre": "John Doe",
+    "Username": "jdoe",
+    "TypeItemSelectionne": 3,
+    "TypeItemString": "Etudiant",
+    "NbEtudiants": 0
+}
+
+
+class TestMioManager:
     """Test cases for MioManager class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_session = MagicMock()
-        # Mock the initialization GET request
-        self.mock_session.get.return_value = Mock()
+    @classmethod
+    def setup_class(cls):
+        """Build the canned pages once; they are read-only and reused."""
+        cls.list_page = html_response(MIO_LIST_HTML)
+        cls.detail_page = html_response(MIO_DETAIL_HTML)
+        # Parsed once for tests that don't exercise page parsing itself
+        cls.detail_tree = parse_html(MIO_DETAIL_HTML)
     
-    @patch('omnivox.mio.manager.BeautifulSoup')
-    def test_get_message_previews(self, mock_bs):
-        """Test getting message previews."""
-        # Mock HTML response with message data
-        mock_response = Mock()
-        mock_response.text = 'chk12345678-1234-1234-1234-123456789abc'
-        mock_response.raise_for_status = Mock()
-        self.mock_session.get.return_value = mock_response
-        
-        # Mock parsed HTML
-        mock_soup = Mock()
-        
-        # Mock message elements
-        name_elem = Mock()
-        name_elem.get_text.return_value = "John Doe"
-        
-        title_elem = Mock()
-        title_elem.get_text.return_value = "Test Message"
-        
-        desc_elem = Mock()
-        desc_elem.get_text.return_value = "This is a test message"
-        
-        mock_soup.select.side_effect = lambda sel: {
-            '.name': [name_elem],
-            '.lsTdTitle > div > em': [title_elem],
-            '.lsTdTitle > div': [desc_elem]
-        }.get(sel, [])
-        
-        mock_bs.return_value = mock_soup
-        
-        # Create manager and test
-        manager = MioManager(self.mock_session)
+    @patch('requests.Session.get')
+    def test_plain_session_gets_pooled_adapter(self, mock_get):
+        """Test that a bare requests.Session is given pooling and retries."""
+        session = requests.Session()
+        del session.headers['Accept-Encoding']
+        
+        MioManager(session)
+        
+        adapter = session.get_adapter(MioManager.MIO_LIST_URL)
+        assert adapter.max_retries.total == 3
+        assert adapter._pool_maxsize == 32
+        assert 'gzip' in session.headers['Accept-Encoding']
+    
+    def test_get_message_previews(self, mock_session):
+        """Test parsing message previews from the inbox page."""
+        mock_session.get.return_value = self.list_page
+        
+        manager = MioManager(mock_session)
         previews = manager.get_message_previews()
         
-        self.assertIsInstance(previews, list)
+        assert len(previews) == 1
+        assert previews[0].id == "012345678-1234-1234-1234-123456789abc"
+        assert previews[0].author == "John Doe"
+        assert previews[0].title == "Test Message"
+        assert previews[0].short_desc == "Test Message This is a test message"
     
-    @patch('omnivox.mio.manager.BeautifulSoup')
-    def test_get_message_by_id(self, mock_bs):
-        """Test getting a message by ID."""
-        # Mock HTML response
-        mock_response = Mock()
-        mock_response.text = '<html>Message content</html>'
-        mock_response.raise_for_status = Mock()
-        self.mock_session.get.return_value = mock_response
-        
-        # Mock parsed HTML
-        mock_soup = Mock()
+    @patch('omnivox.mio.manager.parse_html')
+    def test_get_message_previews_skips_tree_parse(self, mock_parse, mock_session):
+        """Test that the usual inbox markup is read without building a tree."""
+        mock_session.get.return_value = self.list_page
         
-        content_wrapper = Mock()
-        content_wrapper.get_text.return_value = "Message body"
+        manager = MioManager(mock_session)
+        previews = manager.get_message_previews()
         
-        from_elem = Mock()
-        from_elem.get_text.return_value = "John Doe"
+        assert len(previews) == 1
+        mock_parse.assert_not_called()
+    
+    def test_get_message_previews_unusual_markup(self, mock_session):
+        """Test falling back to the parsed tree when the row scan doesn't fit."""
+        page = MIO_LIST_HTML.replace(b'John Doe', b'<b>John Doe</b>')
+        mock_session.get.return_value = html_response(page)
         
-        to_elem = Mock()
-        to_elem.get_text.return_value = "Jane Smith"
+        manager = MioManager(mock_session)
+        previews = manager.get_message_previews()
         
-        title_elem = Mock()
-        title_elem.get_text.return_value = "Test Message"
+        assert len(previews) == 1
+        assert previews[0].id == "012345678-1234-1234-1234-123456789abc"
+        assert previews[0].author == "John Doe"
+        assert previews[0].title == "Test Message"
+    
+    def test_get_message_previews_scan_matches_tree(self, mock_session):
+        """Test that the row scan and the parsed tree build the same previews."""
+        page = MIO_LIST_HTML.replace(b'John Doe', b'John&nbsp;Doe&nbsp;')
+        page = page.replace(
+            b'<em>Test Message</em> This',
+            b'<em>Test  <b>Message</b>&nbsp;</em>  <i>This</i>&nbsp;'
+        )
+        mock_session.get.return_value = html_response(page)
+        manager = MioManager(mock_session)
         
-        date_elem = Mock()
-        date_elem.get_text.return_value = "2024-01-15"
+        scanned = manager.get_message_previews()
+        with patch('omnivox.mio.manager._scan_previews', return_value=None):
+            parsed = manager.get_message_previews()
         
-        mock_soup.select_one.side_effect = lambda sel: {
-            '#contenuWrapper': content_wrapper,
-            '.cDe': from_elem,
-            '#tdACont': to_elem,
-            '.cSujet': title_elem,
-            '.cDate': date_elem
-        }.get(sel)
+        assert scanned == parsed
+    
+    def test_get_message_previews_meta_charset(self, mock_session):
+        """Test that a page without a charset header is decoded from its <meta> tag."""
+        page = MIO_LIST_HTML.replace(b'<html>', b'<html><head><meta charset="windows-1252"></head>')
+        page = page.replace(b'John Doe', 'Hélène'.encode('cp1252'))
+        page = page.replace(b'Test Message', 'Réunion'.encode('cp1252'))
+        response = html_response(page)
+        response.headers = {'Content-Type': 'text/html'}
+        mock_session.get.return_value = response
+        
+        manager = MioManager(mock_session)
+        previews = manager.get_message_previews()
         
-        mock_bs.return_value = mock_soup
+        assert previews[0].author == "Hélène"
+        assert previews[0].title == "Réunion"
+    
+    def test_get_message_by_id(self, mock_session):
+        """Test getting a message by ID."""
+        mock_session.get.return_value = self.detail_page
         
-        # Create manager and test
-        manager = MioManager(self.mock_session)
+        manager = MioManager(mock_session)
         message = manager.get_message_by_id("test-id-123")
         
-        self.assertIsInstance(message, Mio)
-        self.assertEqual(message.id, "test-id-123")
+        assert isinstance(message, Mio)
+        assert message.id == "test-id-123"
+        assert message.author == "John Doe"
+        assert message.recipient == "Jane Smith"
+        assert message.title == "Test Message"
+        assert message.date == FROZEN_DATE
+        assert message.content == "Message body — résumé"
+    
+    def test_get_messages_by_ids(self, mock_session):
+        """Test fetching several messages concurrently."""
+        mock_session.get.return_value = self.detail_page
+        
+        manager = MioManager(mock_session)
+        messages = manager.get_messages_by_ids(["id-1", "id-2", "id-1"])
+        
+        assert [m.id for m in messages] == ["id-1", "id-2", "id-1"]
+        assert messages[0] is messages[2]
+        assert messages[0].author is messages[1].author
+        # One GET for the MIO cookie, one per distinct message
+        assert mock_session.get.call_count == 3
+    
+    def test_message_cache_evicts_least_recently_used(self, mock_session):
+        """Test that the message cache stays bounded."""
+        mock_session.get.return_value = self.detail_page
+        
+        manager = MioManager(mock_session)
+        manager.MESSAGE_CACHE_SIZE = 2
+        with patch('omnivox.mio.manager.parse_html_stream', return_value=self.detail_tree):
+            manager.get_message_by_id("id-1")
+            manager.get_message_by_id("id-2")
+            manager.get_message_by_id("id-1")
+            manager.get_message_by_id("id-3")
+        
+        assert list(manager._cached_messages) == ["id-1", "id-3"]
+        
+        manager.clear_message_cache()
+        assert len(manager._cached_messages) == 0
+    
+    @pytest.mark.parametrize("body", [b'<html><body></body></html>', b'', b'  \r\n'])
+    def test_get_message_by_id_not_found(self, mock_session, body):
+        """Test getting a message whose page has no content, or no body at all."""
+        mock_session.get.return_value = html_response(body)
+        
+        manager = MioManager(mock_session)
+        
+        with pytest.raises(NotFoundError):
+            manager.get_message_by_id("missing-id")
 
 
-class TestMioModels(unittest.TestCase):
+class TestMioModels:
     """Test cases for MIO data models."""
     
-    def test_mio_preview_creation(self):
-        """Test creating a MioPreview object."""
-        preview = MioPreview(
-            id="12345678-1234-1234-1234-123456789abc",
-            author="John Doe",
-            title="Test Message",
-            short_desc="This is a preview"
-        )
-        
-        self.assertEqual(preview.author, "John Doe")
-        self.assertEqual(preview.title, "Test Message")
+    @pytest.mark.parametrize("model", [MioPreview, Mio, SearchUser])
+    @settings(max_examples=25, deadline=None)
+    @given(data=st.data())
+    def test_model_roundtrip(self, model, data):
+        """Test that models keep their fields and compare equal when rebuilt."""
+        obj = data.draw(model_strategy(model))
+        copy = model(**{f.name: getattr(obj, f.name) for f in fields(model)})
+        
+        assert copy == obj
+        assert hash(copy) == hash(obj)
     
-    def test_mio_creation(self):
-        """Test creating a Mio object."""
-        mio = Mio(
-            id="12345678-1234-1234-1234-123456789abc",
-            author="John Doe",
-            recipient="Jane Smith",
-            title="Test Message",
-            date="2024-01-15",
-            content="This is the full message content."
-        )
-        
-        self.assertEqual(mio.author, "John Doe")
-        self.assertEqual(mio.recipient, "Jane Smith")
-        self.assertEqual(mio.date, "2024-01-15")
-    
-    def test_search_user_creation(self):
-        """Test creating a SearchUser object."""
-        user = SearchUser(
-            numero="1234567",
-            titre="John Doe",
-            username="jdoe",
-            type_item_selectionne=3,
-            type_item_string="Etudiant"
-        )
+    def test_mio_preview_is_frozen(self):
+        """Test that previews are immutable and hashable."""
+        preview = MioPreview("id-1", "John Doe", "Test Message", "This is a preview")
         
-        self.assertEqual(user.numero, "1234567")
-        self.assertEqual(user.titre, "John Doe")
-        self.assertEqual(user.type_item_string, "Etudiant")
+        with pytest.raises(FrozenInstanceError):
+            preview.title = "Changed"
+        assert len({preview, MioPreview("id-1", "John Doe", "Test Message", "This is a preview")}) == 1
     
     def test_search_user_from_api_response(self):
         """Test creating SearchUser from API response."""
-        api_data = {
-            "Numero": "1234567",
-            "Titre": "John Doe",
-            "Username": "jdoe",
-            "TypeItemSelectionne": 3,
-            "TypeItemString": "Etudiant",
-            "NbEtudiants": 0
-        }
-        
-        user = SearchUser.from_api_response(api_data)
-        
-        self.assertEqual(user.numero, "1234567")
-        self.assertEqual(user.titre, "John Doe")
-
-
-if __name__ == '__main__':
-    unittest.main()
+        user = SearchUser.from_api_response(_SAMPLE_API_USER)
+        
+        assert user.numero == "1234567"
+        assert user.titre == "John Doe"
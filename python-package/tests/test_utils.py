@@ -1,9 +1,12 @@
 """Tests for utility functions."""
 
-import unittest
+import pytest
+from lxml import html as lxml_html
 from omnivox.utils import (
     decode_html_entities,
     remove_extra_whitespace,
+    clean_html_text,
+    first_by_id_or_class,
     extract_k_token,
     parse_schedule,
     safe_int,
@@ -11,66 +14,89 @@ from omnivox.utils import (
 )
 
 
-class TestUtils(unittest.TestCase):
-    """Test cases for utility functions."""
-    
-    def test_decode_html_entities(self):
-        """Test HTML entity decoding."""
-        text = "Hello&nbsp;World&amp;Test"
-        result = decode_html_entities(text)
-        self.assertEqual(result, "Hello World&Test")
-    
-    def test_decode_html_entities_with_tags(self):
-        """Test HTML entity decoding with tags."""
-        text = "<p>Hello&nbsp;World</p>"
-        result = decode_html_entities(text)
-        self.assertEqual(result, "Hello World")
-    
-    def test_remove_extra_whitespace(self):
-        """Test whitespace removal."""
-        text = "Hello     World"
-        result = remove_extra_whitespace(text)
-        self.assertEqual(result, "Hello\nWorld")
-    
-    def test_extract_k_token(self):
-        """Test k token extraction."""
-        html = '<input name="k" value="6123456789012345678">'
-        result = extract_k_token(html)
-        self.assertEqual(result, "6123456789012345678")
-    
-    def test_extract_k_token_not_found(self):
-        """Test k token extraction when not found."""
-        html = '<input name="other" value="12345">'
-        result = extract_k_token(html)
-        self.assertIsNone(result)
-    
-    def test_parse_schedule(self):
-        """Test schedule parsing."""
-        schedule_text = "Mon 10:00-12:00, Wed 14:00-16:00"
-        result = parse_schedule(schedule_text)
-        self.assertEqual(len(result), 2)
-        self.assertEqual(result[0], "Mon 10:00-12:00")
-        self.assertEqual(result[1], "Wed 14:00-16:00")
-    
-    def test_parse_schedule_empty(self):
-        """Test parsing empty schedule."""
-        result = parse_schedule("")
-        self.assertEqual(result, [])
-    
-    def test_safe_int(self):
-        """Test safe integer conversion."""
-        self.assertEqual(safe_int("123"), 123)
-        self.assertEqual(safe_int("  456  "), 456)
-        self.assertEqual(safe_int("invalid"), 0)
-        self.assertEqual(safe_int("invalid", -1), -1)
+@pytest.mark.parametrize("text,expected", [
+    ("Hello&nbsp;World&amp;Test", "Hello World&Test"),
+    ("It&#39;s&#x2F;&apos;ok&apos; &amp;lt;", "It's/'ok' &lt;"),
+    ("<p>Hello&nbsp;World</p>", "Hello World"),
+    ("Lecture 1 - Introduction", "Lecture 1 - Introduction"),
+])
+def test_decode_html_entities(text, expected):
+    """Test HTML entity decoding, including numeric entities and tags."""
+    assert decode_html_entities(text) == expected
+
+
+def test_remove_extra_whitespace():
+    """Test whitespace removal."""
+    assert remove_extra_whitespace("Hello     World") == "Hello\nWorld"
+
+
+def test_clean_html_text():
+    """Test tag removal, whitespace and entity handling in one call."""
+    text = "  <p>Hello&nbsp;<b>World</b>     &amp; more</p>  "
+    assert clean_html_text(text) == "Hello World\n& more"
+
+
+@pytest.mark.parametrize("text", [
+    "a&nbsp;&nbsp;b",
+    "a &nbsp;b",
+    "a&#160;&#160;b",
+    "a&#xA0;\xa0b",
+    "a&nbsp;b &amp;&nbsp;c",
+    "body&nbsp;&nbsp;&nbsp;x &lt;y&gt;",
+])
+def test_clean_html_text_matches_decode_then_fold(text):
+    """Test that runs written with entities fold like decoded whitespace."""
+    assert clean_html_text(text) == remove_extra_whitespace(decode_html_entities(text))
+
+
+def test_first_by_id_or_class():
+    """Test indexing elements by id and class, keeping the first of each."""
+    root = lxml_html.fromstring(
+        '<div><p id="a" class="x y">1</p><p class="y">2</p><p id="a">3</p></div>'
+    )
+    first, second, _ = root
     
-    def test_safe_float(self):
-        """Test safe float conversion."""
-        self.assertEqual(safe_float("12.5"), 12.5)
-        self.assertEqual(safe_float("  45.67  "), 45.67)
-        self.assertEqual(safe_float("invalid"), 0.0)
-        self.assertEqual(safe_float("invalid", -1.0), -1.0)
+    assert first_by_id_or_class(root) == {'a': first, 'x': first, 'y': first}
+    assert first_by_id_or_class([second]) == {'y': second}
+
+
+@pytest.mark.parametrize("html,expected", [
+    ('<input name="k" value="6123456789012345678">', "6123456789012345678"),
+    (b'<input type="hidden" name="k" value="6123456789012345678" />', "6123456789012345678"),
+    ('<input name="k" value="61234', None),
+    ('<input name="other" value="12345">', None),
+])
+def test_extract_k_token(html, expected):
+    """Test k token extraction from text or bytes, cut short or missing."""
+    assert extract_k_token(html) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Mon 10:00-12:00, Wed 14:00-16:00", ["Mon 10:00-12:00", "Wed 14:00-16:00"]),
+    ("", []),
+])
+def test_parse_schedule(text, expected):
+    """Test schedule parsing."""
+    assert parse_schedule(text) == expected
+
+
+@pytest.mark.parametrize("raw,default,expected", [
+    ("123", 0, 123),
+    ("  456  ", 0, 456),
+    ("invalid", 0, 0),
+    ("invalid", -1, -1),
+])
+def test_safe_int(raw, default, expected):
+    """Test safe integer conversion."""
+    assert safe_int(raw, default) == expected
 
 
-if __name__ == '__main__':
-    unittest.main()
+@pytest.mark.parametrize("raw,default,expected", [
+    ("12.5", 0.0, 12.5),
+    ("  45.67  ", 0.0, 45.67),
+    ("invalid", 0.0, 0.0),
+    ("invalid", -1.0, -1.0),
+])
+def test_safe_float(raw, default, expected):
+    """Test safe float conversion."""
+    assert safe_float(raw, default) == expected